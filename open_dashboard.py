@@ -1,5 +1,5 @@
 import os
-import webbrowser
+import subprocess
 import sys
 
 def open_dashboard():
@@ -8,22 +8,22 @@ def open_dashboard():
         # Get the absolute path to the dashboard HTML file
         script_dir = os.path.dirname(os.path.abspath(__file__))
         dashboard_path = os.path.join(script_dir, 'visualizations', 'dashboard.html')
-        
-        # Convert to file URI format
+
+        print(f"Opening dashboard at: {dashboard_path}")
+
+        # Hand the file directly to the platform's registered handler,
+        # skipping webbrowser's browser-probing and file:// URI munging
         if sys.platform.startswith('win'):
-            dashboard_uri = f'file:///{dashboard_path.replace("\\", "/")}'
+            os.startfile(dashboard_path)
+        elif sys.platform == 'darwin':
+            subprocess.Popen(['open', dashboard_path])
         else:
-            dashboard_uri = f'file://{dashboard_path}'
-        
-        print(f"Opening dashboard at: {dashboard_uri}")
-        
-        # Open in the default web browser
-        webbrowser.open(dashboard_uri)
-        
+            subprocess.Popen(['xdg-open', dashboard_path])
+
         print("Dashboard opened in your default web browser.")
         print("If the browser didn't open automatically, you can manually open this file:")
         print(dashboard_path)
-        
+
     except Exception as e:
         print(f"Error opening dashboard: {e}")
         print("You can manually open the dashboard by navigating to:")
@@ -1,12 +1,189 @@
-import ast, networkx as nx
-import uuid
+import ast
+import collections
+import copy
+import enum
+import functools
+import itertools
+import re
+import sys
 import logging
+import numpy as np
+from dataclasses import dataclass, field
 from typing import Dict, List, Any, Optional
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
 logger = logging.getLogger(__name__)
 
+def configure_logging(level=logging.INFO):
+    """Install the default logging configuration.
+
+    Called explicitly by entry points so that merely importing this module
+    does not attach a root handler.
+    """
+    logging.basicConfig(level=level, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+class ExecutionStatus(enum.Enum):
+    """Outcome of one tool call in an executed plan."""
+    SUCCESS = 'success'
+    ERROR = 'error'
+    UNKNOWN_TOOL = 'unknown_tool'
+    POLICY_VIOLATION = 'policy_violation'
+
+class ExecutionResult(str):
+    """An execution log line carrying structured outcome fields.
+
+    Subclasses str so existing consumers that print or substring-match the
+    message keep working, while new callers branch on .status and read
+    .tool directly instead of parsing the text back apart.
+    """
+
+    __slots__ = ('status', 'tool')
+
+    def __new__(cls, message: str, status: ExecutionStatus, tool: Optional[str] = None):
+        self = super().__new__(cls, message)
+        self.status = status
+        self.tool = tool
+        return self
+
+# Intent keywords are matched in a single pass over the lowercased query by
+# one compiled alternation instead of an independent substring scan per keyword
+_INTENT_RE = re.compile(r'send|bob|document|search|find')
+
+def _eval_literal(node) -> Any:
+    """Evaluate a parsed pseudo-code literal, treating bare names as strings.
+
+    The pseudo-code embeds identifiers like `query` without quoting; they
+    stand for themselves, so Name nodes resolve to their identifier text.
+    """
+    if isinstance(node, ast.Dict):
+        return {_eval_literal(k): _eval_literal(v)
+                for k, v in zip(node.keys, node.values)}
+    if isinstance(node, ast.Constant):
+        return node.value
+    if isinstance(node, ast.Name):
+        return node.id
+    raise ValueError(f"Unsupported pseudo-code literal: {ast.dump(node)}")
+
+def _parse_tool_call(line: str) -> Optional[Dict[str, Any]]:
+    """Parse the dict literal out of a `tool_calls.append(...)` line.
+
+    Returns the structured tool-call dict, or None if the line does not
+    contain a well-formed dict literal.
+    """
+    start = line.find('{')
+    end = line.rfind('}')
+    if start == -1 or end == -1:
+        return None
+    try:
+        tree = ast.parse(line[start:end + 1], mode='eval')
+        return _eval_literal(tree.body)
+    except (SyntaxError, ValueError):
+        return None
+
+@dataclass(slots=True)
+class ToolCall:
+    """One parsed tool invocation from the pseudo-code.
+
+    The plans this agent produces are tiny and have no inter-call edges, so
+    a flat list of these records replaces the former networkx.DiGraph and
+    its dict-of-dict node storage.
+    """
+    id: int
+    command: str
+    tool: Optional[str]
+    params: Dict[str, Any] = field(default_factory=dict)
+    capability: str = 'untrusted'
+    policy_ok: bool = False
+
+# Monotonic record IDs: these only need to be unique within the process,
+# so a counter replaces uuid4's os.urandom call and hex formatting per node
+_node_counter = itertools.count()
+
+@functools.lru_cache(maxsize=1024)
+def _tool_call_template(code: str) -> List[ToolCall]:
+    """Parse pseudo-code into tool-call records, memoized per code string.
+
+    The pseudo-code is parsed once into structured records so the
+    downstream passes do plain attribute lookups instead of re-scanning
+    the command string.
+    """
+    tool_calls = []
+    for line in code.splitlines():
+        if "tool_calls.append" in line:
+            node_id = next(_node_counter)
+            call = _parse_tool_call(line)
+            if call is None:
+                tool_calls.append(ToolCall(node_id, line.strip(), None))
+            else:
+                tool_calls.append(ToolCall(node_id, line.strip(),
+                                           call.get('tool'),
+                                           call.get('params', {}) or {}))
+
+            # In a real implementation, we would also extract data
+            # dependencies between tool calls
+    return tool_calls
+
+@functools.lru_cache(maxsize=1024)
+def _extract_control_flow_cached(query: str):
+    """Generate the tool-call line and structured calls for a lowercased query.
+
+    Pure given the query text, so repeat queries skip the pattern matching
+    and string assembly entirely. The structured tool-call dicts are built
+    alongside the pseudo-code so the rest of the pipeline never has to
+    parse the string back. The caller prepends the header, which carries
+    the query in its original case.
+    """
+    # In a real implementation, this would call a privileged LLM
+    # Here we simulate the behavior with simple pattern matching
+
+    # Simple pattern matching to detect intents: one linear scan
+    # collects every keyword hit, then set membership classifies
+    hits = set(_INTENT_RE.findall(query))
+    if "send" in hits and ("bob" in hits or "document" in hits):
+        line = ("tool_calls.append({'tool': 'send_email', 'params': "
+                "{'recipient': 'bob@company.com', 'document': 'confidential.txt', "
+                "'capability': 'trusted_email'}}))")
+        calls = ({'tool': 'send_email',
+                  'params': {'recipient': 'bob@company.com',
+                             'document': 'confidential.txt',
+                             'capability': 'trusted_email'},
+                  'command': line},)
+    elif "search" in hits or "find" in hits:
+        line = ("tool_calls.append({'tool': 'search_document', 'params': "
+                "{'query': query, 'capability': 'user_query'}}))")
+        calls = ({'tool': 'search_document',
+                  'params': {'query': 'query', 'capability': 'user_query'},
+                  'command': line},)
+    else:
+        line = "# No specific tool calls detected"
+        calls = ()
+
+    return line, calls
+
+# Plans below this size are checked record-by-record; larger batches go
+# through the array kernel where the per-record Python overhead dominates
+_BATCH_THRESHOLD = 64
+
+def _check_batch_py(tool_ids, cap_ids, allowed):
+    out = np.empty(tool_ids.shape[0], np.bool_)
+    for i in range(tool_ids.shape[0]):
+        t = tool_ids[i]
+        c = cap_ids[i]
+        out[i] = t >= 0 and c >= 0 and allowed[t, c]
+    return out
+
+if HAS_NUMBA:
+    # Compiles to a tight integer-compare loop; cache=True persists the
+    # compiled kernel across processes
+    _check_batch = njit(cache=True)(_check_batch_py)
+else:
+    _check_batch = _check_batch_py
+
 class SecureAgent:
     """A secure AI agent that defends against prompt injection attacks.
     
@@ -16,24 +193,66 @@ class SecureAgent:
     3. Enforcing security policies before execution
     4. Providing real-time feedback during execution
     """
-    
+
+    # Fixed attribute set: avoids a per-instance __dict__ and speeds the
+    # self.* lookups in the enforcement and execution loops
+    __slots__ = ('tool_registry', 'policies', 'execution_log',
+                 '_allow', '_tool_ids', '_cap_ids', '_allowed')
+
     def __init__(self):
         self.tool_registry = {}
         self.policies = {}
-        self.execution_log = []
+        # Bounded so long-running agents don't accumulate log entries
+        # without limit; appends stay O(1)
+        self.execution_log = collections.deque(maxlen=10_000)
+        # Every permitted (tool, capability) pair, materialized at
+        # registration so enforcement is a single set lookup per record
+        self._allow = set()
+        # Integer interning tables and (tool, capability) allow-matrix
+        # backing the batched enforcement kernel
+        self._tool_ids = {}
+        self._cap_ids = {}
+        self._allowed = np.zeros((0, 0), np.bool_)
     
     def register_tool(self, tool_name: str, tool_func: callable, required_capabilities: List[str]):
         """Register a tool with the agent and its required capabilities."""
+        # Interned names let the set/dict probes on the enforcement path
+        # short-circuit on pointer equality
+        tool_name = sys.intern(tool_name)
+        required_capabilities = [sys.intern(c) for c in required_capabilities]
         self.tool_registry[tool_name] = {
             'function': tool_func,
-            'required_capabilities': required_capabilities
+            # frozenset: the capability check in enforce_policies becomes an
+            # O(1) hash probe instead of a list scan
+            'required_capabilities': frozenset(required_capabilities)
         }
-        logger.info(f"Registered tool: {tool_name} with capabilities: {required_capabilities}")
+
+        self._allow |= {(tool_name, cap) for cap in required_capabilities}
+
+        # Refresh the interning tables and allow-matrix for batch checks
+        self._tool_ids.setdefault(tool_name, len(self._tool_ids))
+        for cap in required_capabilities:
+            self._cap_ids.setdefault(cap, len(self._cap_ids))
+        allowed = np.zeros((len(self._tool_ids), len(self._cap_ids)), np.bool_)
+        for name, meta in self.tool_registry.items():
+            for cap in meta['required_capabilities']:
+                allowed[self._tool_ids[name], self._cap_ids[cap]] = True
+        self._allowed = allowed
+
+        logger.info("Registered tool: %s with capabilities: %s", tool_name, required_capabilities)
     
     def register_policy(self, policy_name: str, policy_func: callable):
         """Register a security policy with the agent."""
         self.policies[policy_name] = policy_func
-        logger.info(f"Registered policy: {policy_name}")
+        logger.info("Registered policy: %s", policy_name)
+
+    def reset(self):
+        """Clear session-scoped state, keeping registered tools and policies.
+
+        Cheap enough to call between queries (or test methods) when a
+        fresh log matters but re-registering every tool would not.
+        """
+        self.execution_log.clear()
     
     def extract_control_flow(self, query: str) -> str:
         """Simulate a privileged LLM converting natural language query into pseudo-Python code.
@@ -43,219 +262,210 @@ class SecureAgent:
         
         Args:
             query: The natural language query from the user
-            
+
         Returns:
-            A string containing pseudo-Python code representing the intended tool calls
+            A (pseudo_code, tool_calls) pair: the pseudo-Python code kept for
+            display and logging, and the already-structured tool-call dicts
+            the rest of the pipeline consumes directly
         """
-        logger.info(f"Extracting control flow from query: {query}")
-        
-        # In a real implementation, this would call a privileged LLM
-        # Here we simulate the behavior with simple pattern matching
-        pseudo_code = f"# Generated pseudo-code from query: {query}\n"
-        pseudo_code += "tool_calls = []\n"
-        
-        # Simple pattern matching to detect intents
-        if "send" in query.lower() and ("bob" in query.lower() or "document" in query.lower()):
-            pseudo_code += ("tool_calls.append({'tool': 'send_email', 'params': "
-                          "{'recipient': 'bob@company.com', 'document': 'confidential.txt', "
-                          "'capability': 'trusted_email'}}))\n")
-        elif "search" in query.lower() or "find" in query.lower():
-            pseudo_code += ("tool_calls.append({'tool': 'search_document', 'params': "
-                          "{'query': query, 'capability': 'user_query'}}))\n")
-        else:
-            pseudo_code += "# No specific tool calls detected\n"
-            
-        logger.debug(f"Generated pseudo-code:\n{pseudo_code}")
-        return pseudo_code
+        logger.info("Extracting control flow from query: %s", query)
+
+        # Lowercasing is only for the cache key and intent matching; the
+        # header keeps the query as the user typed it, since the stored
+        # pseudo-code is displayed back verbatim
+        line, calls = _extract_control_flow_cached(query.lower())
+        pseudo_code = (f"# Generated pseudo-code from query: {query}\n"
+                       "tool_calls = []\n"
+                       f"{line}\n")
+        logger.debug("Generated pseudo-code:\n%s", pseudo_code)
+        return pseudo_code, calls
     
-    def build_dependency_graph(self, code: str) -> nx.DiGraph:
-        """Build a data flow dependency graph from the pseudo-code.
-        
-        This function creates a graph representation of data dependencies between
-        tool calls, which is essential for tracking how data flows through the system
+    def build_dependency_graph(self, code: str) -> List[ToolCall]:
+        """Build the list of tool-call records from the pseudo-code.
+
+        This function creates a structured representation of the tool calls,
+        which is essential for tracking how data flows through the system
         and enforcing security policies.
-        
+
         Args:
             code: The pseudo-code generated from the user query
-            
+
         Returns:
-            A directed graph representing data dependencies
+            A list of ToolCall records
         """
         logger.info("Building dependency graph from pseudo-code")
-        G = nx.DiGraph()
-        
-        # Parse the pseudo-code to extract tool calls and their dependencies
-        tool_calls = []
-        for line in code.splitlines():
-            if "tool_calls.append" in line:
-                # Extract the tool call information
-                node_id = str(uuid.uuid4())
-                G.add_node(node_id, command=line.strip())
-                
-                # In a real implementation, we would parse the AST to extract
-                # data dependencies between tool calls
-                # For simplicity, we're just adding nodes without edges here
-                
-        logger.debug(f"Dependency graph created with {len(G.nodes)} nodes")
-        return G
-    
-    def annotate_capabilities(self, graph: nx.DiGraph) -> nx.DiGraph:
-        """Annotate the dependency graph with capability information.
-        
-        This function adds capability annotations to each node in the graph,
-        indicating what operations are permitted on the data.
-        
+
+        # Identical pseudo-code yields identical records, so the parsed
+        # template is memoized; copies keep later annotation passes from
+        # mutating the cached instances
+        plan = [copy.copy(tc) for tc in _tool_call_template(code)]
+        logger.debug("Dependency graph created with %d nodes", len(plan))
+        return plan
+
+    def annotate_capabilities(self, plan: List[ToolCall]) -> List[ToolCall]:
+        """Annotate the tool-call records with capability information.
+
+        This function adds capability annotations to each record, indicating
+        what operations are permitted on the data.
+
         Args:
-            graph: The dependency graph to annotate
-            
+            plan: The tool-call records to annotate
+
         Returns:
-            The annotated dependency graph
+            The annotated tool-call records
         """
         logger.info("Annotating dependency graph with capabilities")
-        
-        for node in graph.nodes:
-            command = graph.nodes[node].get('command', '')
-            
-            # Extract capability information from the command
-            if "'capability':" in command:
-                # Extract the capability string
-                capability_start = command.find("'capability':")
-                capability_end = command.find("}", capability_start)
-                capability = command[capability_start:capability_end].split(":")[1].strip().strip("'")
-                
-                # Annotate the node with the capability
-                graph.nodes[node]['capability'] = capability
-                logger.debug(f"Node {node} annotated with capability: {capability}")
-            else:
-                # Default capability is 'untrusted'
-                graph.nodes[node]['capability'] = 'untrusted'
-                logger.debug(f"Node {node} annotated with default capability: untrusted")
-                
-        return graph
-    
-    def enforce_policies(self, graph: nx.DiGraph) -> Dict[str, bool]:
-        """Enforce security policies on the annotated dependency graph.
-        
-        This function checks each node in the graph against the registered
-        security policies to ensure that the intended operations comply with
-        the security requirements.
-        
+
+        for tc in plan:
+            # The capability travels with the parsed params; default to
+            # 'untrusted' when the pseudo-code did not declare one
+            tc.capability = tc.params.get('capability', 'untrusted')
+            logger.debug("Node %s annotated with capability: %s", tc.id, tc.capability)
+
+        return plan
+
+    def enforce_policies(self, plan: List[ToolCall]) -> Dict[int, bool]:
+        """Enforce security policies on the annotated tool-call records.
+
+        This function checks each record against the registered security
+        policies to ensure that the intended operations comply with the
+        security requirements.
+
         Args:
-            graph: The annotated dependency graph
-            
+            plan: The annotated tool-call records
+
         Returns:
-            A dictionary mapping node IDs to policy compliance results
+            A dictionary mapping record IDs to policy compliance results
         """
         logger.info("Enforcing security policies on dependency graph")
-        
+
+        if len(plan) >= _BATCH_THRESHOLD:
+            return self._enforce_policies_batch(plan)
+
         policy_results = {}
-        
-        for node in graph.nodes:
-            command = graph.nodes[node].get('command', '')
-            capability = graph.nodes[node].get('capability', 'untrusted')
-            
-            # Extract tool name and parameters
-            if "'tool':" in command:
-                tool_start = command.find("'tool':")
-                tool_end = command.find(",", tool_start)
-                tool_name = command[tool_start:tool_end].split(":")[1].strip().strip("'")
-                
-                params_start = command.find("'params':")
-                params_end = command.find("})", params_start)
-                params_str = command[params_start:params_end].split(":", 1)[1].strip()
-                
-                # Convert params string to dictionary (simplified)
-                params = {}
-                for param_pair in params_str.strip("{").strip("}").split(","):
-                    if ':' in param_pair:
-                        key, value = param_pair.split(":", 1)
-                        params[key.strip().strip("'")] = value.strip().strip("'")
-                
-                # Check if the tool exists in the registry
-                if tool_name in self.tool_registry:
-                    # Check if the required capabilities are satisfied
-                    required_capabilities = self.tool_registry[tool_name]['required_capabilities']
-                    
-                    # For simplicity, we're just checking if the capability is in the required list
-                    # In a real implementation, this would be more sophisticated
-                    if capability in required_capabilities:
-                        policy_results[node] = True
-                        logger.debug(f"Node {node} ({tool_name}) passed capability check")
-                    else:
-                        policy_results[node] = False
-                        logger.warning(f"Node {node} ({tool_name}) failed capability check: {capability} not in {required_capabilities}")
+
+        for tc in plan:
+            if tc.tool is not None:
+                # One lookup in the precomputed allow-set covers both the
+                # registry and capability checks
+                # In a real implementation, this would be more sophisticated
+                allowed = (tc.tool, tc.capability) in self._allow
+                policy_results[tc.id] = allowed
+                if allowed:
+                    logger.debug("Node %s (%s) passed capability check", tc.id, tc.tool)
+                elif tc.tool not in self.tool_registry:
+                    logger.warning("Node %s references unknown tool: %s", tc.id, tc.tool)
                 else:
-                    policy_results[node] = False
-                    logger.warning(f"Node {node} references unknown tool: {tool_name}")
+                    logger.warning("Node %s (%s) failed capability check: %s not in %s",
+                                   tc.id, tc.tool, tc.capability,
+                                   self.tool_registry[tc.tool]['required_capabilities'])
             else:
-                policy_results[node] = True  # Non-tool nodes are allowed by default
-                
+                policy_results[tc.id] = True  # Non-tool nodes are allowed by default
+
         return policy_results
-    
-    def execute_plan(self, graph: nx.DiGraph, policy_results: Dict[str, bool]) -> List[str]:
+
+    def _enforce_policies_batch(self, plan: List[ToolCall]) -> Dict[int, bool]:
+        """Capability-check a large plan through the array kernel.
+
+        Tool names and capabilities are mapped to interned integer IDs and
+        the whole batch is checked in one pass over the allow-matrix,
+        avoiding the per-record dict lookups of the scalar path.
+        """
+        tool_calls = [tc for tc in plan if tc.tool is not None]
+        tool_ids = np.array([self._tool_ids.get(tc.tool, -1) for tc in tool_calls],
+                            np.int32)
+        cap_ids = np.array([self._cap_ids.get(tc.capability, -1) for tc in tool_calls],
+                           np.int32)
+        ok = _check_batch(tool_ids, cap_ids, self._allowed)
+
+        # Non-tool records are allowed by default, as in the scalar path
+        policy_results = {tc.id: True for tc in plan if tc.tool is None}
+        for tc, passed in zip(tool_calls, ok):
+            policy_results[tc.id] = bool(passed)
+        return policy_results
+
+    def plan(self, query: str) -> List[ToolCall]:
+        """Build the annotated, policy-checked plan for a query in one pass.
+
+        Fuses control-flow extraction, capability annotation and policy
+        enforcement into a single traversal of the parsed tool calls,
+        instead of three separate passes over the same records.
+
+        Args:
+            query: The natural language query from the user
+
+        Returns:
+            Tool-call records with capability and policy_ok already set
+        """
+        _, calls = self.extract_control_flow(query)
+        plan = []
+        for call in calls:
+            tc = ToolCall(next(_node_counter), call['command'],
+                          call['tool'], dict(call['params']))
+            plan.append(tc)
+            tc.capability = tc.params.get('capability', 'untrusted')
+            tc.policy_ok = tc.tool is None or (tc.tool, tc.capability) in self._allow
+            if not tc.policy_ok:
+                logger.warning("Node %s (%s) failed capability check: %s",
+                               tc.id, tc.tool, tc.capability)
+        return plan
+
+    def execute_plan(self, plan: List[ToolCall], policy_results: Optional[Dict[int, bool]] = None) -> List[ExecutionResult]:
         """Execute the validated plan by checking each tool call against security policies.
-        
-        This function executes the tool calls in the dependency graph, but only if
+
+        This function executes the tool calls in the plan, but only if
         they comply with the security policies.
-        
+
         Args:
-            graph: The annotated dependency graph
-            policy_results: The results of policy enforcement
-            
+            plan: The annotated tool-call records
+            policy_results: The results of policy enforcement; omitted when
+                the plan carries its own policy_ok flags (see plan())
+
         Returns:
             A list of execution results
         """
         logger.info("Executing validated plan")
-        
+
         result_log = []
-        
-        for node in graph.nodes:
-            command = graph.nodes[node].get('command', '')
-            
-            # Check if the node passed policy enforcement
-            if policy_results.get(node, False):
-                # Extract tool name and parameters
-                if "'tool':" in command:
-                    tool_start = command.find("'tool':")
-                    tool_end = command.find(",", tool_start)
-                    tool_name = command[tool_start:tool_end].split(":")[1].strip().strip("'")
-                    
-                    params_start = command.find("'params':")
-                    params_end = command.find("})", params_start)
-                    params_str = command[params_start:params_end].split(":", 1)[1].strip()
-                    
-                    # Convert params string to dictionary (simplified)
-                    params = {}
-                    for param_pair in params_str.strip("{").strip("}").split(","):
-                        if ':' in param_pair:
-                            key, value = param_pair.split(":", 1)
-                            params[key.strip().strip("'")] = value.strip().strip("'")
-                    
+
+        for tc in plan:
+            # Check if the record passed policy enforcement
+            passed = tc.policy_ok if policy_results is None else policy_results.get(tc.id, False)
+            if passed:
+                if tc.tool is not None:
                     # Remove capability from params before execution
-                    if 'capability' in params:
-                        del params['capability']
-                    
+                    params = dict(tc.params)
+                    params.pop('capability', None)
+
                     # Execute the tool
-                    if tool_name in self.tool_registry:
+                    if tc.tool in self.tool_registry:
                         try:
-                            tool_func = self.tool_registry[tool_name]['function']
+                            tool_func = self.tool_registry[tc.tool]['function']
                             result = tool_func(**params)
-                            result_log.append(f"Successfully executed {tool_name}: {result}")
-                            logger.info(f"Successfully executed {tool_name}")
+                            result_log.append(ExecutionResult(
+                                f"Successfully executed {tc.tool}: {result}",
+                                ExecutionStatus.SUCCESS, tc.tool))
+                            logger.info("Successfully executed %s", tc.tool)
                         except Exception as e:
-                            result_log.append(f"Error executing {tool_name}: {str(e)}")
-                            logger.error(f"Error executing {tool_name}: {str(e)}")
+                            result_log.append(ExecutionResult(
+                                f"Error executing {tc.tool}: {str(e)}",
+                                ExecutionStatus.ERROR, tc.tool))
+                            logger.error("Error executing %s: %s", tc.tool, e)
                     else:
-                        result_log.append(f"Unknown tool: {tool_name}")
-                        logger.warning(f"Unknown tool: {tool_name}")
+                        result_log.append(ExecutionResult(
+                            f"Unknown tool: {tc.tool}",
+                            ExecutionStatus.UNKNOWN_TOOL, tc.tool))
+                        logger.warning("Unknown tool: %s", tc.tool)
             else:
-                # Node failed policy enforcement
-                result_log.append(f"Security policy violation: {command}")
-                logger.warning(f"Security policy violation: {command}")
-                
+                # Record failed policy enforcement
+                result_log.append(ExecutionResult(
+                    f"Security policy violation: {tc.command}",
+                    ExecutionStatus.POLICY_VIOLATION, tc.tool))
+                logger.warning("Security policy violation: %s", tc.command)
+
         return result_log
     
-    def process_query(self, query: str) -> List[str]:
+    def process_query(self, query: str) -> List[ExecutionResult]:
         """Process a user query through the secure agent pipeline.
         
         This function orchestrates the entire secure agent pipeline, from
@@ -267,23 +477,14 @@ class SecureAgent:
         Returns:
             A list of execution results
         """
-        logger.info(f"Processing query: {query}")
-        
-        # Step 1: Extract control flow from the query
-        pseudo_code = self.extract_control_flow(query)
-        
-        # Step 2: Build dependency graph from the pseudo-code
-        dependency_graph = self.build_dependency_graph(pseudo_code)
-        
-        # Step 3: Annotate the graph with capabilities
-        annotated_graph = self.annotate_capabilities(dependency_graph)
-        
-        # Step 4: Enforce security policies on the annotated graph
-        policy_results = self.enforce_policies(annotated_graph)
-        
-        # Step 5: Execute the validated plan
-        execution_results = self.execute_plan(annotated_graph, policy_results)
-        
+        logger.info("Processing query: %s", query)
+
+        # Step 1: Build the annotated, policy-checked plan in one fused pass
+        plan = self.plan(query)
+
+        # Step 2: Execute the validated plan
+        execution_results = self.execute_plan(plan)
+
         # Log the results
         self.execution_log.extend(execution_results)
         
@@ -300,6 +501,8 @@ def search_document(query: str) -> str:
 
 # Main function for demonstration
 def main():
+    configure_logging()
+
     # Create a secure agent
     agent = SecureAgent()
     
@@ -1,11 +1,23 @@
 """AI service module for interacting with OpenAI API."""
 
-import openai
+import re
 from typing import Dict, List, Any, Optional
 from . import config
 
-# Configure OpenAI API
-openai.api_key = config.OPENAI_API_KEY
+def _get_openai():
+    """Import and configure the OpenAI client on first use.
+
+    The openai package is heavy to import, so it is loaded lazily by the
+    code paths that actually call the API rather than at module import.
+    """
+    import openai
+    openai.api_key = config.OPENAI_API_KEY
+    return openai
+
+# Security checks compiled once: a single regex pass replaces the repeated
+# per-pattern substring scans over each query
+_SQLI_RE = re.compile(r'drop\s+table|delete\s+from|;|--', re.IGNORECASE)
+_EMAIL_RE = re.compile(r'@([A-Za-z0-9.\-]+\.(?:com|org|net))')
 
 class AIService:
     """Service for interacting with OpenAI API."""
@@ -83,23 +95,21 @@ class AIService:
             }
             
             # Check for SQL injection patterns
-            if any(pattern in query.lower() for pattern in ['drop table', 'delete from', ';', '--']):
+            if _SQLI_RE.search(query):
                 policies['sql_injection'] = {
                     'result': 'fail',
                     'message': 'Potential SQL injection detected'
                 }
-            
+
             # Check for email domains
-            if '@' in query:
-                email_parts = query.split('@')
-                for i in range(1, len(email_parts)):
-                    domain = email_parts[i].split()[0].strip('.,;:"\'')
-                    if domain not in config.TRUSTED_EMAIL_DOMAINS and any(c in domain for c in ['.com', '.org', '.net']):
-                        policies['email_domain'] = {
-                            'result': 'fail',
-                            'message': f'Untrusted email domain: {domain}'
-                        }
-                        break
+            for match in _EMAIL_RE.finditer(query):
+                domain = match.group(1)
+                if domain not in config.TRUSTED_EMAIL_DOMAINS:
+                    policies['email_domain'] = {
+                        'result': 'fail',
+                        'message': f'Untrusted email domain: {domain}'
+                    }
+                    break
             
             return {'policies': policies}
         except Exception as e:
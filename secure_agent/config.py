@@ -2,6 +2,7 @@
 
 import os
 import dotenv
+from functools import lru_cache
 from pathlib import Path
 
 # Load environment variables from .env file
@@ -14,13 +15,21 @@ OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 DATABASE_PATH = Path(__file__).parent.parent / 'data' / 'secure_agent.db'
 
 # Security settings
-TRUSTED_EMAIL_DOMAINS = ['company.com', 'trusted-partner.com']
+# frozenset: membership checks on the security hot path are O(1) hash probes
+TRUSTED_EMAIL_DOMAINS = frozenset({'company.com', 'trusted-partner.com'})
 MAX_QUERY_LENGTH = 1000
 
 # Logging settings
 LOG_LEVEL = 'INFO'
 LOG_FILE = Path(__file__).parent.parent / 'logs' / 'secure_agent.log'
 
-# Ensure directories exist
-DATABASE_PATH.parent.mkdir(parents=True, exist_ok=True)
-LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
+# Directory creation is deferred to the code paths that actually open the
+# database or log file, so importing this module issues no syscalls; the
+# lru_cache makes repeat calls free
+@lru_cache(maxsize=None)
+def ensure_db_dir():
+    DATABASE_PATH.parent.mkdir(parents=True, exist_ok=True)
+
+@lru_cache(maxsize=None)
+def ensure_log_dir():
+    LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
@@ -1,12 +1,28 @@
+import collections
+import functools
+import hashlib
+import itertools
 import logging
-import uuid
+import pickle
+import sys
 from typing import Dict, Any, List, Set, Optional, Tuple
-import networkx as nx
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Payloads at least this large (per sys.getsizeof) are deduplicated by
+# content hash instead of referenced from every node that carries them
+_PAYLOAD_DEDUP_MIN = 512
+
+class _PayloadRef:
+    """A handle to a payload stored once in the content-addressed store."""
+
+    __slots__ = ('digest',)
+
+    def __init__(self, digest: bytes):
+        self.digest = digest
+
 class DataFlowTracker:
     """Tracks data flow through the system and enforces capability restrictions.
     
@@ -15,10 +31,89 @@ class DataFlowTracker:
     """
     
     def __init__(self):
-        self.data_graph = nx.DiGraph()
+        # Plain adjacency lists: provenance only ever walks predecessors,
+        # and list iteration is far lighter than the dict-of-dicts a
+        # networkx DiGraph allocates per node
+        self._pred = collections.defaultdict(list)
+        self._succ = collections.defaultdict(list)
         self.data_nodes = {}
+        # Monotonic integer IDs: cheaper to allocate and hash than the
+        # 36-char uuid4 strings they replace, and need no urandom syscall
+        self._next_id = itertools.count(1)
+        # Capability strings are mapped to bit positions on first sight;
+        # each node then stores its capabilities as a single int bitmask,
+        # so intersection/membership are one-word AND operations
+        self._cap_bits: Dict[str, int] = {}
+        self._cap_names: List[str] = []
+        # Graph/capability mutations bump _version; it is part of the
+        # provenance cache key, so stale traversals can never be served
+        self._version = 0
+        self._trace_provenance = functools.lru_cache(maxsize=1024)(self._trace_provenance_uncached)
+        # Requirement lists repeat across calls; cache their folded masks
+        # keyed by the capability vocabulary size so a requirement that was
+        # unknown is re-resolved once new capabilities appear
+        self._required_mask = functools.lru_cache(maxsize=256)(self._required_mask_uncached)
+        # Content-addressed store for large payloads: identical data routed
+        # through many nodes is kept once, keyed by its hash
+        self._payload_store: Dict[bytes, Any] = {}
+
+    def _intern_payload(self, data: Any) -> Any:
+        """Store a large payload once, returning a reference to it.
+
+        Small or unpicklable payloads are returned as-is.
+        """
+        if sys.getsizeof(data) < _PAYLOAD_DEDUP_MIN:
+            return data
+        try:
+            digest = hashlib.blake2b(pickle.dumps(data), digest_size=16).digest()
+        except Exception:
+            return data
+        self._payload_store.setdefault(digest, data)
+        return _PayloadRef(digest)
+
+    def _resolve_payload(self, value: Any) -> Any:
+        """Return the payload behind a reference, or the value itself."""
+        if isinstance(value, _PayloadRef):
+            return self._payload_store[value.digest]
+        return value
+
+    def _required_mask_uncached(self, capabilities: Tuple[str, ...], _vocab_size: int) -> Optional[int]:
+        """Fold required capabilities into a mask, or None if any is unknown."""
+        mask = 0
+        for capability in capabilities:
+            bit = self._cap_bits.get(capability)
+            if bit is None:
+                return None
+            mask |= bit
+        return mask
+
+    def _capability_bit(self, capability: str) -> int:
+        """Return the bit for a capability, assigning one on first sight."""
+        capability = sys.intern(capability)
+        bit = self._cap_bits.get(capability)
+        if bit is None:
+            bit = 1 << len(self._cap_names)
+            self._cap_bits[capability] = bit
+            self._cap_names.append(capability)
+        return bit
+
+    def _capability_mask(self, capabilities: List[str]) -> int:
+        """Fold a list of capability strings into a bitmask."""
+        mask = 0
+        for capability in capabilities:
+            mask |= self._capability_bit(capability)
+        return mask
+
+    def _capability_set(self, mask: int) -> Set[str]:
+        """Expand a bitmask back into the set of capability strings."""
+        names = set()
+        while mask:
+            low = mask & -mask
+            names.add(self._cap_names[low.bit_length() - 1])
+            mask ^= low
+        return names
         
-    def create_data_node(self, data: Any, source: str, capabilities: List[str]) -> str:
+    def create_data_node(self, data: Any, source: str, capabilities: List[str]) -> int:
         """Create a new data node in the graph.
         
         Args:
@@ -29,25 +124,19 @@ class DataFlowTracker:
         Returns:
             The ID of the created node
         """
-        node_id = str(uuid.uuid4())
-        
-        self.data_graph.add_node(
-            node_id,
-            data=data,
-            source=source,
-            capabilities=set(capabilities)
-        )
+        node_id = next(self._next_id)
         
         self.data_nodes[node_id] = {
-            'data': data,
-            'source': source,
-            'capabilities': set(capabilities)
+            'data': self._intern_payload(data),
+            'source': sys.intern(source),
+            'capabilities': self._capability_mask(capabilities)
         }
         
+        self._version += 1
         logger.debug(f"Created data node {node_id} with source {source} and capabilities {capabilities}")
         return node_id
     
-    def create_derived_data_node(self, data: Any, parent_ids: List[str], transformation: str) -> str:
+    def create_derived_data_node(self, data: Any, parent_ids: List[int], transformation: str) -> int:
         """Create a new data node derived from existing nodes.
         
         Args:
@@ -58,32 +147,24 @@ class DataFlowTracker:
         Returns:
             The ID of the created node
         """
-        node_id = str(uuid.uuid4())
+        node_id = next(self._next_id)
         
-        # Calculate the intersection of parent capabilities
+        # Intersect parent capabilities: one AND per parent on the masks
         parent_capabilities = None
         for parent_id in parent_ids:
             if parent_id in self.data_nodes:
-                parent_caps = self.data_nodes[parent_id]['capabilities']
+                parent_mask = self.data_nodes[parent_id]['capabilities']
                 if parent_capabilities is None:
-                    parent_capabilities = set(parent_caps)
+                    parent_capabilities = parent_mask
                 else:
-                    parent_capabilities &= set(parent_caps)
+                    parent_capabilities &= parent_mask
         
-        # If no parents or no common capabilities, use empty set
+        # If no parents or no common capabilities, use the empty mask
         if parent_capabilities is None:
-            parent_capabilities = set()
-        
-        self.data_graph.add_node(
-            node_id,
-            data=data,
-            source='derived',
-            capabilities=parent_capabilities,
-            transformation=transformation
-        )
+            parent_capabilities = 0
         
         self.data_nodes[node_id] = {
-            'data': data,
+            'data': self._intern_payload(data),
             'source': 'derived',
             'capabilities': parent_capabilities,
             'transformation': transformation
@@ -92,12 +173,14 @@ class DataFlowTracker:
         # Add edges from parents to this node
         for parent_id in parent_ids:
             if parent_id in self.data_nodes:
-                self.data_graph.add_edge(parent_id, node_id)
+                self._pred[node_id].append(parent_id)
+                self._succ[parent_id].append(node_id)
         
-        logger.debug(f"Created derived data node {node_id} with capabilities {parent_capabilities}")
+        self._version += 1
+        logger.debug(f"Created derived data node {node_id} with capabilities {self._capability_set(parent_capabilities)}")
         return node_id
     
-    def add_capability(self, node_id: str, capability: str) -> bool:
+    def add_capability(self, node_id: int, capability: str) -> bool:
         """Add a capability to a data node.
         
         Args:
@@ -108,15 +191,15 @@ class DataFlowTracker:
             True if the capability was added, False otherwise
         """
         if node_id in self.data_nodes:
-            self.data_nodes[node_id]['capabilities'].add(capability)
-            self.data_graph.nodes[node_id]['capabilities'].add(capability)
+            self.data_nodes[node_id]['capabilities'] |= self._capability_bit(capability)
+            self._version += 1
             logger.debug(f"Added capability {capability} to node {node_id}")
             return True
         else:
             logger.warning(f"Cannot add capability to unknown node: {node_id}")
             return False
     
-    def remove_capability(self, node_id: str, capability: str) -> bool:
+    def remove_capability(self, node_id: int, capability: str) -> bool:
         """Remove a capability from a data node.
         
         Args:
@@ -127,9 +210,10 @@ class DataFlowTracker:
             True if the capability was removed, False otherwise
         """
         if node_id in self.data_nodes:
-            if capability in self.data_nodes[node_id]['capabilities']:
-                self.data_nodes[node_id]['capabilities'].remove(capability)
-                self.data_graph.nodes[node_id]['capabilities'].remove(capability)
+            bit = self._cap_bits.get(capability, 0)
+            if self.data_nodes[node_id]['capabilities'] & bit:
+                self.data_nodes[node_id]['capabilities'] &= ~bit
+                self._version += 1
                 logger.debug(f"Removed capability {capability} from node {node_id}")
                 return True
             else:
@@ -139,7 +223,7 @@ class DataFlowTracker:
             logger.warning(f"Cannot remove capability from unknown node: {node_id}")
             return False
     
-    def has_capability(self, node_id: str, capability: str) -> bool:
+    def has_capability(self, node_id: int, capability: str) -> bool:
         """Check if a data node has a specific capability.
         
         Args:
@@ -150,12 +234,13 @@ class DataFlowTracker:
             True if the node has the capability, False otherwise
         """
         if node_id in self.data_nodes:
-            return capability in self.data_nodes[node_id]['capabilities']
+            bit = self._cap_bits.get(capability, 0)
+            return bool(self.data_nodes[node_id]['capabilities'] & bit)
         else:
             logger.warning(f"Cannot check capability of unknown node: {node_id}")
             return False
     
-    def get_data(self, node_id: str) -> Optional[Any]:
+    def get_data(self, node_id: int) -> Optional[Any]:
         """Get the data stored in a node.
         
         Args:
@@ -165,12 +250,12 @@ class DataFlowTracker:
             The data stored in the node, or None if the node doesn't exist
         """
         if node_id in self.data_nodes:
-            return self.data_nodes[node_id]['data']
+            return self._resolve_payload(self.data_nodes[node_id]['data'])
         else:
             logger.warning(f"Cannot get data from unknown node: {node_id}")
             return None
     
-    def get_capabilities(self, node_id: str) -> Set[str]:
+    def get_capabilities(self, node_id: int) -> Set[str]:
         """Get the capabilities of a node.
         
         Args:
@@ -180,12 +265,12 @@ class DataFlowTracker:
             The set of capabilities for the node, or empty set if the node doesn't exist
         """
         if node_id in self.data_nodes:
-            return self.data_nodes[node_id]['capabilities']
+            return self._capability_set(self.data_nodes[node_id]['capabilities'])
         else:
             logger.warning(f"Cannot get capabilities of unknown node: {node_id}")
             return set()
     
-    def check_operation_allowed(self, node_id: str, operation: str, required_capabilities: List[str]) -> bool:
+    def check_operation_allowed(self, node_id: int, operation: str, required_capabilities: List[str]) -> bool:
         """Check if an operation is allowed on a data node.
         
         Args:
@@ -197,13 +282,19 @@ class DataFlowTracker:
             True if the operation is allowed, False otherwise
         """
         if node_id in self.data_nodes:
-            node_capabilities = self.data_nodes[node_id]['capabilities']
+            node_mask = self.data_nodes[node_id]['capabilities']
             
-            # Check if the node has all required capabilities
-            for capability in required_capabilities:
-                if capability not in node_capabilities:
-                    logger.warning(f"Operation {operation} on node {node_id} denied: missing capability {capability}")
-                    return False
+            # None means a capability the tracker has never seen, which no
+            # node can carry
+            req_mask = self._required_mask(tuple(required_capabilities), len(self._cap_bits))
+            if req_mask is None:
+                logger.warning(f"Operation {operation} on node {node_id} denied: unknown required capability")
+                return False
+            
+            # All required bits present: one AND plus one compare
+            if node_mask & req_mask != req_mask:
+                logger.warning(f"Operation {operation} on node {node_id} denied: missing capabilities")
+                return False
             
             logger.debug(f"Operation {operation} on node {node_id} allowed")
             return True
@@ -211,7 +302,7 @@ class DataFlowTracker:
             logger.warning(f"Cannot check operation on unknown node: {node_id}")
             return False
     
-    def get_provenance(self, node_id: str) -> List[Dict[str, Any]]:
+    def get_provenance(self, node_id: int) -> List[Dict[str, Any]]:
         """Get the provenance of a data node.
         
         This function traces the lineage of a data node back to its sources.
@@ -227,31 +318,47 @@ class DataFlowTracker:
             return []
         
         provenance = []
-        visited = set()
-        
-        def dfs(current_id, path):
-            if current_id in visited:
-                return
-            
-            visited.add(current_id)
-            
-            if current_id in self.data_nodes:
-                node_info = self.data_nodes[current_id].copy()
-                node_info['id'] = current_id
-                node_info['path'] = path
-                
-                # Convert set to list for serialization
-                if 'capabilities' in node_info:
-                    node_info['capabilities'] = list(node_info['capabilities'])
-                
-                provenance.append(node_info)
-                
-                # Recursively visit predecessors
-                for pred in self.data_graph.predecessors(current_id):
-                    dfs(pred, path + [current_id])
-        
-        dfs(node_id, [])
+        for current_id, path in self._trace_provenance(node_id, self._version):
+            node_info = self.data_nodes[current_id].copy()
+            node_info['data'] = self._resolve_payload(node_info['data'])
+            node_info['id'] = current_id
+            node_info['path'] = list(path)
+
+            # Expand the mask to a list for serialization
+            if 'capabilities' in node_info:
+                node_info['capabilities'] = list(self._capability_set(node_info['capabilities']))
+
+            provenance.append(node_info)
+
         return provenance
+
+    def _trace_provenance_uncached(self, node_id: int, version: int) -> Tuple[Tuple[int, Tuple[int, ...]], ...]:
+        """Walk ancestors of a node, returning (id, path) pairs in BFS order.
+
+        Wrapped in an lru_cache per instance so repeated provenance queries
+        over shared ancestry skip the traversal; the version argument keys
+        the cache to the current graph state.
+        """
+        order = []
+        # IDs are dense integers from the counter, so the visited check is
+        # a bytearray index instead of a hashed set lookup
+        visited = bytearray(len(self.data_nodes) + 1)
+
+        # Iterative BFS: no Python call per edge and no recursion limit on
+        # deep lineages; paths are tuples so extending them is a cheap copy
+        queue = collections.deque([(node_id, ())])
+        while queue:
+            current_id, path = queue.popleft()
+            if visited[current_id]:
+                continue
+            visited[current_id] = 1
+            order.append((current_id, path))
+
+            child_path = path + (current_id,)
+            queue.extend((pred, child_path)
+                         for pred in self._pred[current_id])
+
+        return tuple(order)
     
     def visualize_graph(self, output_file: str = 'data_flow_graph.png') -> None:
         """Visualize the data flow graph.
@@ -261,18 +368,26 @@ class DataFlowTracker:
         """
         try:
             import matplotlib.pyplot as plt
+            import networkx as nx
             from networkx.drawing.nx_agraph import graphviz_layout
             
             plt.figure(figsize=(12, 8))
             
-            # Create a copy of the graph with simplified labels
-            G = self.data_graph.copy()
+            # Build a DiGraph from the adjacency lists just for drawing
+            G = nx.DiGraph()
+            G.add_nodes_from(self.data_nodes)
+            G.add_edges_from(
+                (source, target)
+                for source, targets in self._succ.items()
+                for target in targets
+            )
             
-            # Add labels to nodes
+            # Add labels to nodes from the attribute store
             labels = {}
             for node in G.nodes:
-                source = G.nodes[node].get('source', 'unknown')
-                caps = G.nodes[node].get('capabilities', set())
+                info = self.data_nodes.get(node, {})
+                source = info.get('source', 'unknown')
+                caps = self._capability_set(info.get('capabilities', 0))
                 labels[node] = f"{source}\n{', '.join(caps)}"
             
             # Draw the graph
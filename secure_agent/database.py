@@ -1,12 +1,67 @@
+import hashlib
+import json
 import sqlite3
 import os
 import logging
+import threading
 from typing import Dict, Any, List, Optional, Tuple
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Payloads larger than this are stored as a hash summary rather than
+# serialized in full
+_MAX_DATA_LEN = 65536
+
+# Buffered log rows are written out once this many have accumulated
+_LOG_FLUSH_THRESHOLD = 256
+
+# Module-level SQL so sqlite3's per-connection statement cache hits the
+# same string object every call
+_SQL_INSERT_EXECUTION = (
+    "INSERT INTO execution_log "
+    "(tool_name, params, result, success, error_message, execution_time) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+_SQL_INSERT_VIOLATION = (
+    "INSERT INTO security_violations "
+    "(tool_name, params, policy_name, violation_details) "
+    "VALUES (?, ?, ?, ?)"
+)
+_SQL_INSERT_TOOL = "INSERT OR REPLACE INTO tools (name, description) VALUES (?, ?)"
+_SQL_SELECT_TOOL_ID = "SELECT id FROM tools WHERE name = ?"
+_SQL_DELETE_TOOL_CAPABILITIES = "DELETE FROM tool_capabilities WHERE tool_id = ?"
+_SQL_INSERT_TOOL_CAPABILITY = "INSERT INTO tool_capabilities (tool_id, capability) VALUES (?, ?)"
+_SQL_INSERT_DATA_NODE = "INSERT OR REPLACE INTO data_nodes (id, data, source) VALUES (?, ?, ?)"
+_SQL_DELETE_NODE_CAPABILITIES = "DELETE FROM data_node_capabilities WHERE node_id = ?"
+_SQL_INSERT_NODE_CAPABILITY = "INSERT INTO data_node_capabilities (node_id, capability) VALUES (?, ?)"
+_SQL_INSERT_DATA_EDGE = (
+    "INSERT OR REPLACE INTO data_node_edges "
+    "(source_id, target_id, relationship) "
+    "VALUES (?, ?, ?)"
+)
+_SQL_INSERT_QUERY = "INSERT INTO queries (query, pseudo_code) VALUES (?, ?)"
+_SQL_SELECT_TOOL_CAPABILITIES = (
+    "SELECT c.capability "
+    "FROM tool_capabilities c "
+    "JOIN tools t ON c.tool_id = t.id "
+    "WHERE t.name = ?"
+)
+_SQL_SELECT_NODE_CAPABILITIES = "SELECT capability FROM data_node_capabilities WHERE node_id = ?"
+_SQL_SELECT_EXECUTION_LOG = "SELECT * FROM execution_log ORDER BY created_at DESC LIMIT ?"
+_SQL_SELECT_VIOLATIONS = "SELECT * FROM security_violations ORDER BY created_at DESC LIMIT ?"
+_SQL_SELECT_QUERIES = "SELECT * FROM queries ORDER BY created_at DESC LIMIT ?"
+
+def _dumps(obj: Any) -> str:
+    """Serialize a value to compact JSON for storage.
+
+    json.dumps runs in C and, unlike the previous str() repr, produces
+    canonical output that can be parsed back when querying the log tables.
+    Non-JSON values fall back to their repr.
+    """
+    return json.dumps(obj, default=repr, separators=(',', ':'))
+
 class SecureDatabase:
     """A secure database for storing agent data with capability-based access control.
     
@@ -21,25 +76,60 @@ class SecureDatabase:
             db_path: The path to the SQLite database file
         """
         self.db_path = db_path
-        self.conn = None
-        self.cursor = None
+        # One connection per thread: with WAL enabled, readers on other
+        # threads run in parallel with a writer instead of serializing on
+        # (or crashing against) a single shared connection
+        self._local = threading.local()
+        self._conns = []
+        self._conns_lock = threading.Lock()
+        # Log rows are buffered in memory and flushed in one transaction,
+        # amortizing the per-commit cost across many entries
+        self._log_lock = threading.Lock()
+        self._exec_buf = []
+        self._violation_buf = []
         
         # Create the database directory if it doesn't exist
         os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
         
-        # Connect to the database
-        self._connect()
-        
         # Initialize the database schema
         self._init_schema()
     
+    @property
+    def conn(self):
+        """The calling thread's connection, opened lazily."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._conns_lock:
+                self._conns.append(conn)
+        return conn
+    
     def _connect(self):
-        """Connect to the SQLite database."""
+        """Open a new connection to the SQLite database."""
         try:
-            self.conn = sqlite3.connect(self.db_path)
-            self.conn.row_factory = sqlite3.Row  # Return rows as dictionaries
-            self.cursor = self.conn.cursor()
+            # A larger statement cache keeps the hot insert/select SQL
+            # prepared across calls instead of reparsing it
+            # check_same_thread=False so close() can shut down connections
+            # opened by worker threads; each connection is still only used
+            # by its owning thread for queries
+            # No Row factory on the connection: the insert paths and the
+            # capability lookups only ever index rows positionally, so
+            # building a column-name map per row is wasted work there
+            conn = sqlite3.connect(self.db_path, cached_statements=256,
+                                   check_same_thread=False)
+            # WAL + synchronous=NORMAL avoid an fsync on every commit,
+            # which dominates the cost of the per-call logging methods.
+            # Foreign keys stay at SQLite's default (off): callers store
+            # edges before their endpoint nodes, so enforcement would
+            # reject writes the store has always accepted
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA mmap_size=268435456")
+            conn.execute("PRAGMA cache_size=-65536")
             logger.debug(f"Connected to database: {self.db_path}")
+            return conn
         except sqlite3.Error as e:
             logger.error(f"Error connecting to database: {str(e)}")
             raise
@@ -48,7 +138,7 @@ class SecureDatabase:
         """Initialize the database schema."""
         try:
             # Create the tools table
-            self.cursor.execute("""
+            self.conn.execute("""
             CREATE TABLE IF NOT EXISTS tools (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 name TEXT NOT NULL UNIQUE,
@@ -58,7 +148,7 @@ class SecureDatabase:
             """)
             
             # Create the tool_capabilities table
-            self.cursor.execute("""
+            self.conn.execute("""
             CREATE TABLE IF NOT EXISTS tool_capabilities (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 tool_id INTEGER NOT NULL,
@@ -69,7 +159,7 @@ class SecureDatabase:
             """)
             
             # Create the execution_log table
-            self.cursor.execute("""
+            self.conn.execute("""
             CREATE TABLE IF NOT EXISTS execution_log (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 tool_name TEXT NOT NULL,
@@ -83,7 +173,7 @@ class SecureDatabase:
             """)
             
             # Create the security_violations table
-            self.cursor.execute("""
+            self.conn.execute("""
             CREATE TABLE IF NOT EXISTS security_violations (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 tool_name TEXT NOT NULL,
@@ -95,7 +185,7 @@ class SecureDatabase:
             """)
             
             # Create the data_nodes table
-            self.cursor.execute("""
+            self.conn.execute("""
             CREATE TABLE IF NOT EXISTS data_nodes (
                 id TEXT PRIMARY KEY,
                 data TEXT,
@@ -105,7 +195,7 @@ class SecureDatabase:
             """)
             
             # Create the data_node_capabilities table
-            self.cursor.execute("""
+            self.conn.execute("""
             CREATE TABLE IF NOT EXISTS data_node_capabilities (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 node_id TEXT NOT NULL,
@@ -116,7 +206,7 @@ class SecureDatabase:
             """)
             
             # Create the data_node_edges table
-            self.cursor.execute("""
+            self.conn.execute("""
             CREATE TABLE IF NOT EXISTS data_node_edges (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 source_id TEXT NOT NULL,
@@ -129,7 +219,7 @@ class SecureDatabase:
             """)
             
             # Create the queries table
-            self.cursor.execute("""
+            self.conn.execute("""
             CREATE TABLE IF NOT EXISTS queries (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 query TEXT NOT NULL,
@@ -138,6 +228,37 @@ class SecureDatabase:
             )
             """)
             
+            # Indexes for the lookup columns the get_* methods filter and
+            # sort on; without them every call scans the full table
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_tool_capabilities_tool_id "
+                "ON tool_capabilities (tool_id, capability)"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_data_node_capabilities_node_id "
+                "ON data_node_capabilities (node_id, capability)"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_data_node_edges_source_id "
+                "ON data_node_edges (source_id)"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_data_node_edges_target_id "
+                "ON data_node_edges (target_id)"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_execution_log_created_at "
+                "ON execution_log (created_at DESC)"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_security_violations_created_at "
+                "ON security_violations (created_at DESC)"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_queries_created_at "
+                "ON queries (created_at DESC)"
+            )
+
             self.conn.commit()
             logger.info("Database schema initialized")
         except sqlite3.Error as e:
@@ -145,10 +266,14 @@ class SecureDatabase:
             raise
     
     def close(self):
-        """Close the database connection."""
-        if self.conn:
-            self.conn.close()
-            logger.debug("Database connection closed")
+        """Flush pending log rows and close every connection."""
+        self._flush_logs()
+        with self._conns_lock:
+            for conn in self._conns:
+                conn.close()
+            self._conns.clear()
+        self._local = threading.local()
+        logger.debug("Database connections closed")
     
     def register_tool(self, name: str, description: str, capabilities: List[str]):
         """Register a tool in the database.
@@ -159,27 +284,23 @@ class SecureDatabase:
             capabilities: The capabilities required by the tool
         """
         try:
-            # Insert the tool
-            self.cursor.execute(
-                "INSERT OR REPLACE INTO tools (name, description) VALUES (?, ?)",
-                (name, description)
-            )
-            
-            # Get the tool ID
-            self.cursor.execute("SELECT id FROM tools WHERE name = ?", (name,))
-            tool_id = self.cursor.fetchone()[0]
-            
-            # Delete existing capabilities
-            self.cursor.execute("DELETE FROM tool_capabilities WHERE tool_id = ?", (tool_id,))
-            
-            # Insert new capabilities
-            for capability in capabilities:
-                self.cursor.execute(
-                    "INSERT INTO tool_capabilities (tool_id, capability) VALUES (?, ?)",
-                    (tool_id, capability)
+            # One explicit transaction for the whole registration
+            with self.conn:
+                # Insert the tool
+                self.conn.execute(_SQL_INSERT_TOOL, (name, description))
+
+                # Get the tool ID
+                tool_id = self.conn.execute(_SQL_SELECT_TOOL_ID, (name,)).fetchone()[0]
+
+                # Delete existing capabilities
+                self.conn.execute(_SQL_DELETE_TOOL_CAPABILITIES, (tool_id,))
+
+                # Insert new capabilities in one statement; binding loops in C
+                self.conn.executemany(
+                    _SQL_INSERT_TOOL_CAPABILITY,
+                    [(tool_id, capability) for capability in capabilities]
                 )
-            
-            self.conn.commit()
+
             logger.info(f"Tool '{name}' registered with capabilities: {capabilities}")
         except sqlite3.Error as e:
             self.conn.rollback()
@@ -199,21 +320,19 @@ class SecureDatabase:
             execution_time: The time taken to execute the tool
         """
         try:
-            # Convert params and result to strings
-            params_str = str(params)
-            result_str = str(result)
+            # Serialize params and result as compact JSON
+            params_str = _dumps(params)
+            result_str = _dumps(result)
             
-            self.cursor.execute(
-                """INSERT INTO execution_log 
-                (tool_name, params, result, success, error_message, execution_time) 
-                VALUES (?, ?, ?, ?, ?, ?)""",
-                (tool_name, params_str, result_str, success, error_message, execution_time)
-            )
-            
-            self.conn.commit()
+            with self._log_lock:
+                self._exec_buf.append(
+                    (tool_name, params_str, result_str, success, error_message, execution_time)
+                )
+                flush = len(self._exec_buf) >= _LOG_FLUSH_THRESHOLD
+            if flush:
+                self._flush_logs()
             logger.debug(f"Execution of tool '{tool_name}' logged")
         except sqlite3.Error as e:
-            self.conn.rollback()
             logger.error(f"Error logging execution: {str(e)}")
             raise
     
@@ -228,23 +347,45 @@ class SecureDatabase:
             violation_details: Details about the violation
         """
         try:
-            # Convert params to string
-            params_str = str(params)
+            # Serialize params as compact JSON
+            params_str = _dumps(params)
             
-            self.cursor.execute(
-                """INSERT INTO security_violations 
-                (tool_name, params, policy_name, violation_details) 
-                VALUES (?, ?, ?, ?)""",
-                (tool_name, params_str, policy_name, violation_details)
-            )
-            
-            self.conn.commit()
+            with self._log_lock:
+                self._violation_buf.append(
+                    (tool_name, params_str, policy_name, violation_details)
+                )
+                flush = len(self._violation_buf) >= _LOG_FLUSH_THRESHOLD
+            if flush:
+                self._flush_logs()
             logger.info(f"Security violation of policy '{policy_name}' logged for tool '{tool_name}'")
         except sqlite3.Error as e:
-            self.conn.rollback()
             logger.error(f"Error logging security violation: {str(e)}")
             raise
     
+    def _row_cursor(self):
+        """A cursor returning sqlite3.Row, for readers that need names."""
+        cursor = self.conn.cursor()
+        cursor.row_factory = sqlite3.Row
+        return cursor
+    
+    def _flush_logs(self):
+        """Write any buffered log rows in a single transaction per table."""
+        with self._log_lock:
+            exec_rows, self._exec_buf = self._exec_buf, []
+            violation_rows, self._violation_buf = self._violation_buf, []
+        if not exec_rows and not violation_rows:
+            return
+        try:
+            with self.conn:
+                if exec_rows:
+                    self.conn.executemany(_SQL_INSERT_EXECUTION, exec_rows)
+                if violation_rows:
+                    self.conn.executemany(_SQL_INSERT_VIOLATION, violation_rows)
+            logger.debug(f"Flushed {len(exec_rows) + len(violation_rows)} buffered log rows")
+        except sqlite3.Error as e:
+            logger.error(f"Error flushing log buffers: {str(e)}")
+            raise
+    
     def store_data_node(self, node_id: str, data: Any, source: str, capabilities: List[str]):
         """Store a data node in the database.
         
@@ -255,26 +396,27 @@ class SecureDatabase:
             capabilities: The capabilities of the data
         """
         try:
-            # Convert data to string
-            data_str = str(data)
-            
-            # Insert the data node
-            self.cursor.execute(
-                "INSERT OR REPLACE INTO data_nodes (id, data, source) VALUES (?, ?, ?)",
-                (node_id, data_str, source)
-            )
-            
-            # Delete existing capabilities
-            self.cursor.execute("DELETE FROM data_node_capabilities WHERE node_id = ?", (node_id,))
-            
-            # Insert new capabilities
-            for capability in capabilities:
-                self.cursor.execute(
-                    "INSERT INTO data_node_capabilities (node_id, capability) VALUES (?, ?)",
-                    (node_id, capability)
+            # Serialize the data; oversized payloads are stored as a hash
+            # summary so huge blobs don't bloat the table
+            data_str = _dumps(data)
+            if len(data_str) > _MAX_DATA_LEN:
+                digest = hashlib.sha256(data_str.encode()).hexdigest()
+                data_str = _dumps({'sha256': digest, 'length': len(data_str)})
+            
+            # One explicit transaction for the node and its capabilities
+            with self.conn:
+                # Insert the data node
+                self.conn.execute(_SQL_INSERT_DATA_NODE, (node_id, data_str, source))
+
+                # Delete existing capabilities
+                self.conn.execute(_SQL_DELETE_NODE_CAPABILITIES, (node_id,))
+
+                # Insert new capabilities in one statement; binding loops in C
+                self.conn.executemany(
+                    _SQL_INSERT_NODE_CAPABILITY,
+                    [(node_id, capability) for capability in capabilities]
                 )
-            
-            self.conn.commit()
+
             logger.debug(f"Data node '{node_id}' stored with capabilities: {capabilities}")
         except sqlite3.Error as e:
             self.conn.rollback()
@@ -290,12 +432,7 @@ class SecureDatabase:
             relationship: The relationship between the nodes
         """
         try:
-            self.cursor.execute(
-                """INSERT OR REPLACE INTO data_node_edges 
-                (source_id, target_id, relationship) 
-                VALUES (?, ?, ?)""",
-                (source_id, target_id, relationship)
-            )
+            self.conn.execute(_SQL_INSERT_DATA_EDGE, (source_id, target_id, relationship))
             
             self.conn.commit()
             logger.debug(f"Data edge from '{source_id}' to '{target_id}' stored")
@@ -312,10 +449,7 @@ class SecureDatabase:
             pseudo_code: The generated pseudo-code
         """
         try:
-            self.cursor.execute(
-                "INSERT INTO queries (query, pseudo_code) VALUES (?, ?)",
-                (query, pseudo_code)
-            )
+            self.conn.execute(_SQL_INSERT_QUERY, (query, pseudo_code))
             
             self.conn.commit()
             logger.debug(f"Query stored: {query}")
@@ -324,6 +458,20 @@ class SecureDatabase:
             logger.error(f"Error storing query: {str(e)}")
             raise
     
+    def store_queries(self, rows: List[Tuple[str, str]]):
+        """Store many (query, pseudo_code) pairs in one transaction.
+        
+        Args:
+            rows: The (query, pseudo_code) pairs to store
+        """
+        try:
+            with self.conn:
+                self.conn.executemany(_SQL_INSERT_QUERY, rows)
+            logger.debug(f"Stored {len(rows)} queries")
+        except sqlite3.Error as e:
+            logger.error(f"Error storing queries: {str(e)}")
+            raise
+    
     def get_tool_capabilities(self, tool_name: str) -> List[str]:
         """Get the capabilities required by a tool.
         
@@ -334,15 +482,7 @@ class SecureDatabase:
             A list of capabilities required by the tool
         """
         try:
-            self.cursor.execute(
-                """SELECT c.capability 
-                FROM tool_capabilities c 
-                JOIN tools t ON c.tool_id = t.id 
-                WHERE t.name = ?""",
-                (tool_name,)
-            )
-            
-            rows = self.cursor.fetchall()
+            rows = self.conn.execute(_SQL_SELECT_TOOL_CAPABILITIES, (tool_name,)).fetchall()
             capabilities = [row[0] for row in rows]
             
             return capabilities
@@ -360,12 +500,7 @@ class SecureDatabase:
             A list of capabilities of the node
         """
         try:
-            self.cursor.execute(
-                "SELECT capability FROM data_node_capabilities WHERE node_id = ?",
-                (node_id,)
-            )
-            
-            rows = self.cursor.fetchall()
+            rows = self.conn.execute(_SQL_SELECT_NODE_CAPABILITIES, (node_id,)).fetchall()
             capabilities = [row[0] for row in rows]
             
             return capabilities
@@ -382,13 +517,10 @@ class SecureDatabase:
         Returns:
             A list of execution log entries
         """
+        # Flush so buffered rows are visible to the reader
+        self._flush_logs()
         try:
-            self.cursor.execute(
-                "SELECT * FROM execution_log ORDER BY created_at DESC LIMIT ?",
-                (limit,)
-            )
-            
-            rows = self.cursor.fetchall()
+            rows = self._row_cursor().execute(_SQL_SELECT_EXECUTION_LOG, (limit,)).fetchall()
             log_entries = [dict(row) for row in rows]
             
             return log_entries
@@ -405,13 +537,10 @@ class SecureDatabase:
         Returns:
             A list of security violation log entries
         """
+        # Flush so buffered rows are visible to the reader
+        self._flush_logs()
         try:
-            self.cursor.execute(
-                "SELECT * FROM security_violations ORDER BY created_at DESC LIMIT ?",
-                (limit,)
-            )
-            
-            rows = self.cursor.fetchall()
+            rows = self._row_cursor().execute(_SQL_SELECT_VIOLATIONS, (limit,)).fetchall()
             log_entries = [dict(row) for row in rows]
             
             return log_entries
@@ -429,12 +558,7 @@ class SecureDatabase:
             A list of query log entries
         """
         try:
-            self.cursor.execute(
-                "SELECT * FROM queries ORDER BY created_at DESC LIMIT ?",
-                (limit,)
-            )
-            
-            rows = self.cursor.fetchall()
+            rows = self._row_cursor().execute(_SQL_SELECT_QUERIES, (limit,)).fetchall()
             log_entries = [dict(row) for row in rows]
             
             return log_entries
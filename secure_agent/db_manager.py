@@ -1,10 +1,67 @@
 import sqlite3
 import argparse
+import itertools
 import os
 import logging
-import json
+import sys
 from typing import Dict, Any, List, Optional
-from tabulate import tabulate
+
+# Result sets below this row count still go through tabulate; larger ones
+# use the lightweight streaming printer
+_TABULATE_MAX_ROWS = 100
+
+# Imports at or above this row count drop the table's indexes first and
+# rebuild them afterwards; below it the rebuild setup cost dominates
+_INDEX_REBUILD_MIN_ROWS = 1000
+
+# Streaming imports flush to executemany in batches of this many rows,
+# capping peak memory at O(batch) regardless of table size
+_IMPORT_BATCH_ROWS = 10000
+
+def _print_table(headers: List[str], rows: List[List[Any]]):
+    """Print a result set, streaming large ones without tabulate.
+
+    tabulate scans every cell twice and assembles the full bordered table
+    in memory; for big results a single sampled width pass plus direct
+    stdout writes avoids that quadratic formatting cost.
+    """
+    if len(rows) < _TABULATE_MAX_ROWS:
+        # Lazy import: vacuum/clear/export invocations never render a table
+        from tabulate import tabulate
+        print(tabulate(rows, headers=headers, tablefmt="grid"))
+        return
+
+    # Column widths from the headers and a sample of the first 200 rows
+    widths = [len(str(h)) for h in headers]
+    for row in itertools.islice(rows, 200):
+        for i, value in enumerate(row):
+            width = len(str(value))
+            if width > widths[i]:
+                widths[i] = width
+
+    fmt = '  '.join('{:<%d}' % w for w in widths) + '\n'
+    write = sys.stdout.write
+    write(fmt.format(*headers))
+    write(fmt.format(*('-' * w for w in widths)))
+    for row in rows:
+        write(fmt.format(*(str(v) for v in row)))
+
+# orjson encodes/decodes several times faster than the stdlib; fall back
+# to compact json when it isn't installed
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+    _loads = orjson.loads
+except ImportError:
+    import json
+
+    def _dumps(obj: Any) -> str:
+        return json.dumps(obj, separators=(',', ':'))
+
+    _loads = json.loads
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -13,15 +70,17 @@ logger = logging.getLogger(__name__)
 class DatabaseManager:
     """A utility for managing the secure agent's database."""
     
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, pragmas: bool = True):
         """Initialize the database manager.
         
         Args:
             db_path: The path to the SQLite database file
+            pragmas: Whether to apply the performance PRAGMAs on connect;
+                read-only callers can pass False to leave the file untouched
         """
         self.db_path = db_path
+        self.pragmas = pragmas
         self.conn = None
-        self.cursor = None
         
         # Check if the database file exists
         if not os.path.exists(db_path):
@@ -36,7 +95,17 @@ class DatabaseManager:
         try:
             self.conn = sqlite3.connect(self.db_path)
             self.conn.row_factory = sqlite3.Row  # Return rows as dictionaries
-            self.cursor = self.conn.cursor()
+            if self.pragmas:
+                # WAL and synchronous=NORMAL cut the fsync traffic of
+                # write-heavy commands; the rest keep temp data and hot
+                # pages in memory
+                self.conn.executescript("""
+                    PRAGMA journal_mode=WAL;
+                    PRAGMA synchronous=NORMAL;
+                    PRAGMA temp_store=MEMORY;
+                    PRAGMA cache_size=-64000;
+                    PRAGMA mmap_size=268435456;
+                """)
             logger.debug(f"Connected to database: {self.db_path}")
         except sqlite3.Error as e:
             logger.error(f"Error connecting to database: {str(e)}")
@@ -48,17 +117,29 @@ class DatabaseManager:
             self.conn.close()
             logger.debug("Database connection closed")
     
+    def _known_tables(self) -> set:
+        """The set of table names present in the database."""
+        cur = self.conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
+        return {row[0] for row in cur.fetchall()}
+    
     def list_tables(self):
         """List all tables in the database."""
         try:
-            self.cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-            tables = [row[0] for row in self.cursor.fetchall()]
-            
+            tables = sorted(self._known_tables())
+
             print("\nDatabase Tables:")
-            for table in tables:
-                self.cursor.execute(f"SELECT COUNT(*) FROM {table}")
-                count = self.cursor.fetchone()[0]
-                print(f"- {table}: {count} rows")
+            # One UNION ALL query returns every count in a single VM run
+            # instead of a round trip per table; names come straight from
+            # sqlite_master, so interpolating them is safe. Chunked to stay
+            # under SQLite's compound-select limit.
+            for start in range(0, len(tables), 100):
+                chunk = tables[start:start + 100]
+                sql = " UNION ALL ".join(
+                    f"SELECT '{table}' AS name, COUNT(*) AS n FROM \"{table}\""
+                    for table in chunk
+                )
+                for table, count in self.conn.execute(sql).fetchall():
+                    print(f"- {table}: {count} rows")
         except sqlite3.Error as e:
             logger.error(f"Error listing tables: {str(e)}")
             raise
@@ -70,16 +151,17 @@ class DatabaseManager:
             table_name: The name of the table
         """
         try:
-            self.cursor.execute(f"PRAGMA table_info({table_name})")
-            columns = self.cursor.fetchall()
-            
-            if not columns:
+            # Validate against sqlite_master before interpolating the name
+            if table_name not in self._known_tables():
                 print(f"\nTable '{table_name}' not found.")
                 return
             
+            columns = self.conn.execute(f"PRAGMA table_info({table_name})").fetchall()
+            
             print(f"\nSchema for table '{table_name}':")
             headers = ["ID", "Name", "Type", "NotNull", "DefaultValue", "PrimaryKey"]
             rows = [[col[0], col[1], col[2], col[3], col[4], col[5]] for col in columns]
+            from tabulate import tabulate
             print(tabulate(rows, headers=headers, tablefmt="grid"))
         except sqlite3.Error as e:
             logger.error(f"Error showing table schema: {str(e)}")
@@ -93,17 +175,26 @@ class DatabaseManager:
             limit: The maximum number of rows to show
         """
         try:
-            self.cursor.execute(f"SELECT * FROM {table_name} LIMIT {limit}")
-            rows = self.cursor.fetchall()
+            # Validate the name, quote it, and bind the limit so the same
+            # prepared statement is reused across calls
+            if table_name not in self._known_tables():
+                print(f"\nTable '{table_name}' not found.")
+                return
+            
+            cur = self.conn.execute(f'SELECT * FROM "{table_name}" LIMIT ?', (limit,))
+            cur.arraysize = 1000
+            headers = [column[0] for column in cur.description]
+            # Iterate the cursor instead of fetchall: rows arrive in
+            # arraysize batches, and list(row) unpacks each in C rather
+            # than indexing column by column
+            data = [list(row) for row in cur]
             
-            if not rows:
+            if not data:
                 print(f"\nNo data found in table '{table_name}'.")
                 return
             
             print(f"\nData in table '{table_name}' (limited to {limit} rows):")
-            headers = [column[0] for column in self.cursor.description]
-            data = [[row[col] for col in range(len(headers))] for row in rows]
-            print(tabulate(data, headers=headers, tablefmt="grid"))
+            _print_table(headers, data)
         except sqlite3.Error as e:
             logger.error(f"Error showing table data: {str(e)}")
             raise
@@ -115,20 +206,20 @@ class DatabaseManager:
             query: The SQL query to execute
         """
         try:
-            self.cursor.execute(query)
+            cur = self.conn.execute(query)
             
             # Check if the query returns data
-            if self.cursor.description:
-                rows = self.cursor.fetchall()
+            if cur.description:
+                rows = cur.fetchall()
                 
                 if not rows:
                     print("\nQuery executed successfully, but no data was returned.")
                     return
                 
                 print("\nQuery results:")
-                headers = [column[0] for column in self.cursor.description]
-                data = [[row[col] for col in range(len(headers))] for row in rows]
-                print(tabulate(data, headers=headers, tablefmt="grid"))
+                headers = [column[0] for column in cur.description]
+                data = [list(row) for row in rows]
+                _print_table(headers, data)
             else:
                 self.conn.commit()
                 print("\nQuery executed successfully.")
@@ -137,37 +228,28 @@ class DatabaseManager:
             print(f"\nError executing query: {str(e)}")
     
     def export_data(self, output_file: str):
-        """Export all data from the database to a JSON file.
-        
+        """Export all data from the database as newline-delimited JSON.
+
+        Each table is announced with a {"__table__": name} header line
+        followed by one JSON object per row, so peak memory stays at one
+        row regardless of database size.
+
         Args:
-            output_file: The path to the output JSON file
+            output_file: The path to the output file
         """
         try:
             # Get all tables
-            self.cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-            tables = [row[0] for row in self.cursor.fetchall()]
-            
-            # Export data from each table
-            data = {}
-            for table in tables:
-                self.cursor.execute(f"SELECT * FROM {table}")
-                rows = self.cursor.fetchall()
-                
-                headers = [column[0] for column in self.cursor.description]
-                table_data = []
-                
-                for row in rows:
-                    row_data = {}
-                    for i, header in enumerate(headers):
-                        row_data[header] = row[i]
-                    table_data.append(row_data)
-                
-                data[table] = table_data
-            
-            # Write data to JSON file
-            with open(output_file, 'w') as f:
-                json.dump(data, f, indent=2)
-            
+            tables = sorted(self._known_tables())
+
+            # Stream rows straight from the cursor to the file
+            with open(output_file, 'w', buffering=1 << 20) as f:
+                for table in tables:
+                    f.write(_dumps({'__table__': table}))
+                    f.write('\n')
+                    for row in self.conn.execute(f'SELECT * FROM "{table}"'):
+                        f.write(_dumps(dict(row)))
+                        f.write('\n')
+
             print(f"\nData exported to {output_file}")
         except sqlite3.Error as e:
             logger.error(f"Error exporting data: {str(e)}")
@@ -176,42 +258,170 @@ class DatabaseManager:
             logger.error(f"Error writing to file: {str(e)}")
             raise
     
+    def export_sql(self, output_file: str):
+        """Export the database as a SQL script via iterdump.
+
+        The dump includes schema and data, so it restores into an empty
+        file with import_sql; iterdump streams statement by statement.
+
+        Args:
+            output_file: The path to the output .sql file
+        """
+        try:
+            with open(output_file, 'w', buffering=1 << 20) as f:
+                f.writelines(f"{stmt}\n" for stmt in self.conn.iterdump())
+            print(f"\nSQL dump written to {output_file}")
+        except sqlite3.Error as e:
+            logger.error(f"Error dumping database: {str(e)}")
+            raise
+        except IOError as e:
+            logger.error(f"Error writing to file: {str(e)}")
+            raise
+
+    def import_sql(self, input_file: str):
+        """Execute a SQL script produced by export_sql against the database.
+
+        Args:
+            input_file: The path to the input .sql file
+        """
+        try:
+            with open(input_file) as f:
+                self.conn.executescript(f.read())
+            print(f"\nSQL script executed from {input_file}")
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            logger.error(f"Error executing SQL script: {str(e)}")
+            raise
+        except IOError as e:
+            logger.error(f"Error reading from file: {str(e)}")
+            raise
+
+    def _table_columns(self) -> Dict[str, set]:
+        """Map every table in the database to its set of column names."""
+        return {
+            table: {col[1] for col in self.conn.execute(f"PRAGMA table_info({table})")}
+            for table in self._known_tables()
+        }
+
+    def _drop_table_indexes(self, table: str) -> List[str]:
+        """Drop a table's indexes and return their CREATE INDEX statements.
+
+        Bulk inserts into indexed tables are dominated by per-row B-tree
+        maintenance; for large batches it is cheaper to drop the indexes,
+        insert, and rebuild them once from the saved SQL text.
+        """
+        indexes = self.conn.execute(
+            "SELECT name, sql FROM sqlite_master "
+            "WHERE type='index' AND tbl_name=? AND sql IS NOT NULL",
+            (table,)
+        ).fetchall()
+        for name, _ in indexes:
+            self.conn.execute(f'DROP INDEX "{name}"')
+        return [create_sql for _, create_sql in indexes]
+
+    def _import_table(self, table: str, table_data: List[Dict[str, Any]], schema: Dict[str, set],
+                      manage_indexes: bool = True):
+        """Insert rows into one table, batching by column set.
+
+        Rows are grouped by the columns they populate so each group can
+        share one prepared INSERT driven by executemany. With
+        manage_indexes the indexes are dropped and rebuilt around large
+        inserts; callers that flush one table in several batches pass
+        False and handle the rebuild themselves.
+        """
+        # One upfront schema pass replaces the per-table sqlite_master
+        # and PRAGMA round trips
+        columns = schema.get(table)
+        if columns is None:
+            print(f"\nTable '{table}' not found in the database. Skipping.")
+            return
+
+        index_sql: List[str] = []
+        if manage_indexes and len(table_data) >= _INDEX_REBUILD_MIN_ROWS:
+            index_sql = self._drop_table_indexes(table)
+
+        groups: Dict[frozenset, List[Dict[str, Any]]] = {}
+        for row_data in table_data:
+            key = frozenset(k for k in row_data if k in columns)
+            groups.setdefault(key, []).append(row_data)
+
+        for key, rows in groups.items():
+            # Statement text and column order are computed once per group;
+            # the generator binds parameters lazily so no second list of
+            # all rows is materialized
+            cols = tuple(sorted(key))
+            placeholders = ', '.join(['?'] * len(cols))
+            columns_str = ', '.join(cols)
+            query = f"INSERT INTO {table} ({columns_str}) VALUES ({placeholders})"
+            self.conn.executemany(
+                query,
+                (tuple(row[c] for c in cols) for row in rows)
+            )
+
+        for create_sql in index_sql:
+            self.conn.execute(create_sql)
+
     def import_data(self, input_file: str):
-        """Import data from a JSON file into the database.
-        
+        """Import data from a JSON or NDJSON file into the database.
+
+        Accepts both the streaming newline-delimited format written by
+        export_data and the older single-document {table: [rows]} layout.
+
         Args:
-            input_file: The path to the input JSON file
+            input_file: The path to the input file
         """
         try:
-            # Read data from JSON file
-            with open(input_file, 'r') as f:
-                data = json.load(f)
-            
-            # Import data into each table
-            for table, table_data in data.items():
-                # Check if the table exists
-                self.cursor.execute(f"SELECT name FROM sqlite_master WHERE type='table' AND name=?", (table,))
-                if not self.cursor.fetchone():
-                    print(f"\nTable '{table}' not found in the database. Skipping.")
-                    continue
-                
-                # Get the table schema
-                self.cursor.execute(f"PRAGMA table_info({table})")
-                columns = [col[1] for col in self.cursor.fetchall()]
-                
-                # Import data
-                for row_data in table_data:
-                    # Filter out keys that don't correspond to columns
-                    filtered_data = {k: v for k, v in row_data.items() if k in columns}
-                    
-                    # Generate the SQL query
-                    placeholders = ', '.join(['?'] * len(filtered_data))
-                    columns_str = ', '.join(filtered_data.keys())
-                    query = f"INSERT INTO {table} ({columns_str}) VALUES ({placeholders})"
-                    
-                    # Execute the query
-                    self.cursor.execute(query, list(filtered_data.values()))
-            
+            # Relax durability for the import session: the whole import is
+            # one transaction anyway, and these avoid per-page fsyncs
+            self.conn.execute("PRAGMA synchronous=OFF")
+            self.conn.execute("PRAGMA journal_mode=MEMORY")
+            schema = self._table_columns()
+            self.conn.execute("BEGIN")
+
+            with open(input_file, 'r', buffering=1 << 20) as f:
+                first_line = f.readline()
+                try:
+                    first = _loads(first_line)
+                    streaming = isinstance(first, dict) and '__table__' in first
+                except ValueError:
+                    streaming = False
+
+                if streaming:
+                    # NDJSON: rows are buffered only until the next table
+                    # header or batch boundary, never the whole file.
+                    # Indexes are dropped lazily on a table's first big
+                    # flush and rebuilt once after the whole file
+                    dropped: Dict[str, List[str]] = {}
+
+                    def _flush(table: str, rows: List[Dict[str, Any]]):
+                        if (table not in dropped
+                                and len(rows) >= _INDEX_REBUILD_MIN_ROWS):
+                            dropped[table] = self._drop_table_indexes(table)
+                        self._import_table(table, rows, schema,
+                                           manage_indexes=False)
+
+                    table = first['__table__']
+                    rows: List[Dict[str, Any]] = []
+                    for line in f:
+                        obj = _loads(line)
+                        if isinstance(obj, dict) and '__table__' in obj:
+                            _flush(table, rows)
+                            table = obj['__table__']
+                            rows = []
+                        else:
+                            rows.append(obj)
+                            if len(rows) >= _IMPORT_BATCH_ROWS:
+                                _flush(table, rows)
+                                rows = []
+                    _flush(table, rows)
+                    for index_sql in dropped.values():
+                        for create_sql in index_sql:
+                            self.conn.execute(create_sql)
+                else:
+                    data = _loads(first_line + f.read())
+                    for table, table_data in data.items():
+                        self._import_table(table, table_data, schema)
+
             self.conn.commit()
             print(f"\nData imported from {input_file}")
         except sqlite3.Error as e:
@@ -221,7 +431,8 @@ class DatabaseManager:
         except IOError as e:
             logger.error(f"Error reading from file: {str(e)}")
             raise
-        except json.JSONDecodeError as e:
+        except ValueError as e:
+            # Covers json.JSONDecodeError and orjson's equivalent
             logger.error(f"Error parsing JSON: {str(e)}")
             raise
     
@@ -232,7 +443,11 @@ class DatabaseManager:
             table_name: The name of the table
         """
         try:
-            self.cursor.execute(f"DELETE FROM {table_name}")
+            if table_name not in self._known_tables():
+                print(f"\nTable '{table_name}' not found.")
+                return
+            
+            self.conn.execute(f'DELETE FROM "{table_name}"')
             self.conn.commit()
             print(f"\nTable '{table_name}' cleared.")
         except sqlite3.Error as e:
@@ -243,7 +458,7 @@ class DatabaseManager:
     def vacuum_database(self):
         """Vacuum the database to reclaim unused space."""
         try:
-            self.cursor.execute("VACUUM")
+            self.conn.execute("VACUUM")
             print("\nDatabase vacuumed.")
         except sqlite3.Error as e:
             logger.error(f"Error vacuuming database: {str(e)}")
@@ -280,6 +495,13 @@ def main():
     import_parser = subparsers.add_parser('import', help='Import data from a JSON file')
     import_parser.add_argument('input', type=str, help='Path to the input JSON file')
     
+    # Export/import SQL dump commands
+    export_sql_parser = subparsers.add_parser('export-sql', help='Export the database as a SQL script')
+    export_sql_parser.add_argument('output', type=str, help='Path to the output SQL file')
+
+    import_sql_parser = subparsers.add_parser('import-sql', help='Execute a SQL script against the database')
+    import_sql_parser.add_argument('input', type=str, help='Path to the input SQL file')
+
     # Clear table command
     clear_parser = subparsers.add_parser('clear', help='Clear all data from a table')
     clear_parser.add_argument('table', type=str, help='Name of the table')
@@ -314,6 +536,10 @@ def main():
             manager.export_data(args.output)
         elif args.command == 'import':
             manager.import_data(args.input)
+        elif args.command == 'export-sql':
+            manager.export_sql(args.output)
+        elif args.command == 'import-sql':
+            manager.import_sql(args.input)
         elif args.command == 'clear':
             manager.clear_table(args.table)
         elif args.command == 'vacuum':
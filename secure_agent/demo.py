@@ -1,18 +1,29 @@
+import contextlib
 import logging
 import argparse
 import os
-import time
+import sys
+import threading
 from typing import Dict, Any, List, Optional
-from colorama import init, Fore, Style
 
-from agent import SecureAgent
+from agent import SecureAgent, ExecutionStatus
 from policies import policy_manager, enforce_policy
 from data_flow import DataFlowTracker
 from interpreter import SecureInterpreter
 from database import SecureDatabase
 
-# Initialize colorama for colored terminal output
-init(autoreset=True)
+# Colorama (and its win32 probing) is only worth importing when the output
+# actually is a terminal; piped runs get a dummy whose attributes are all
+# empty strings, turning the colour f-strings into no-ops
+if sys.stdout.isatty():
+    from colorama import init, Fore, Style
+    init(autoreset=True)
+else:
+    class _NoColor:
+        def __getattr__(self, name: str) -> str:
+            return ''
+
+    Fore = Style = _NoColor()
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -63,14 +74,36 @@ def print_warning(text: str):
     """Print a warning message."""
     print(f"{Fore.YELLOW}{text}{Style.RESET_ALL}")
 
-def animate_processing(duration: float = 1.0):
-    """Animate a processing indicator for the specified duration."""
-    chars = "|/-\\"
-    for _ in range(int(duration * 10)):
-        for char in chars:
-            print(f"\r{Fore.CYAN}Processing {char} ", end="", flush=True)
-            time.sleep(0.1)
-    print(f"\r{' ' * 20}\r", end="", flush=True)
+@contextlib.contextmanager
+def processing_animation():
+    """Show a spinner while the enclosed block runs.
+
+    The spinner runs on a background thread and stops as soon as the real
+    work finishes, so it adds no latency of its own; outside a TTY it is
+    skipped entirely.
+    """
+    if not sys.stdout.isatty():
+        yield
+        return
+
+    stop = threading.Event()
+
+    def spin():
+        chars = "|/-\\"
+        i = 0
+        while not stop.is_set():
+            print(f"\r{Fore.CYAN}Processing {chars[i % len(chars)]} ", end="", flush=True)
+            i += 1
+            stop.wait(0.1)
+        print(f"\r{' ' * 20}\r", end="", flush=True)
+
+    spinner = threading.Thread(target=spin, daemon=True)
+    spinner.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        spinner.join()
 
 def run_demo():
     """Run the secure agent demonstration."""
@@ -136,6 +169,7 @@ def run_demo():
     ]
     
     # Process each query
+    query_rows = []
     for i, demo in enumerate(demo_queries):
         query = demo["query"]
         description = demo["description"]
@@ -146,37 +180,38 @@ def run_demo():
         print_info(f"Expected: {expected}")
         print("\nProcessing query...")
         
-        # Animate processing
-        animate_processing(1.5)
-        
-        # Extract control flow
+        # Extract control flow, animating while the work runs
         print_info("\nExtracting control flow...")
-        pseudo_code = agent.extract_control_flow(query)
+        with processing_animation():
+            pseudo_code, _ = agent.extract_control_flow(query)
         print(f"\nPseudo-code:\n{pseudo_code}")
         
-        # Store the query in the database
-        db.store_query(query, pseudo_code)
+        # Collect the query for one batched insert after the loop;
+        # execution/violation logs are already buffered by the database
+        query_rows.append((query, pseudo_code))
         
         # Process the query
         print_info("\nProcessing query with security policies...")
-        animate_processing(1.0)
-        results = agent.process_query(query)
+        with processing_animation():
+            results = agent.process_query(query)
         
-        # Log the execution in the database
-        for j, result in enumerate(results):
-            if "Successfully executed" in result:
-                tool_name = result.split("Successfully executed ")[1].split(":")[0]
-                db.log_execution(tool_name, {}, result, True, None, 0.1)
+        # Log the execution in the database; results carry their status
+        # and tool directly, so nothing is parsed back out of the text
+        for result in results:
+            if result.status is ExecutionStatus.SUCCESS:
+                db.log_execution(result.tool, {}, result, True, None, 0.1)
                 print_success(f"- {result}")
-            elif "Security policy violation" in result:
-                tool_name = result.split("Security policy violation: ")[1].split(" ")[0]
-                db.log_security_violation(tool_name, {}, "email_domain_policy", result)
+            elif result.status is ExecutionStatus.POLICY_VIOLATION:
+                db.log_security_violation(result.tool or 'unknown', {}, "email_domain_policy", result)
                 print_error(f"- {result}")
             else:
                 print_warning(f"- {result}")
         
         input("\nPress Enter to continue...")
     
+    # One transaction for all stored queries instead of one commit each
+    db.store_queries(query_rows)
+    
     # Print database statistics
     print_header("DATABASE STATISTICS")
     
@@ -1,12 +1,95 @@
 import ast
 import logging
+import sys
+import numpy as np
+from dataclasses import dataclass, field
 from typing import Dict, Any, List, Optional, Tuple, Set
-import networkx as nx
+
+from agent import _parse_tool_call
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Sources below this byte count go straight to ast.parse; the JIT scan
+# only pays off once the full-module parse starts to dominate
+_SCAN_MIN_LEN = 1 << 16
+
+_APPEND_PREFIX = b'tool_calls.append('
+
+if HAS_NUMBA:
+    @njit(cache=True)
+    def _brace_spans(buf):
+        # Offsets of balanced top-level {...} literals in a uint8 view of
+        # the source. Braces inside string literals are not understood;
+        # a span that is not a valid literal simply fails literal_eval
+        # in the caller.
+        starts = []
+        ends = []
+        i = 0
+        n = buf.shape[0]
+        while i < n:
+            if buf[i] == 123:  # '{'
+                depth = 1
+                j = i + 1
+                while j < n and depth > 0:
+                    c = buf[j]
+                    if c == 123:
+                        depth += 1
+                    elif c == 125:  # '}'
+                        depth -= 1
+                    j += 1
+                if depth == 0:
+                    starts.append(i)
+                    ends.append(j)
+                i = j
+            else:
+                i += 1
+        return starts, ends
+else:
+    _brace_spans = None
+
+class _ViolationMsg:
+    """Security-violation result whose text is built only when read.
+
+    Failed nodes often outnumber read log lines, so the params repr is
+    deferred to __str__; substring checks against the rendered text keep
+    working through __contains__.
+    """
+    __slots__ = ('tool', 'params')
+
+    def __init__(self, tool: str, params: Dict[str, Any]):
+        self.tool = tool
+        self.params = params
+
+    def __str__(self) -> str:
+        return f"Security policy violation: {self.tool} with params {self.params}"
+
+    __repr__ = __str__
+
+    def __contains__(self, item: str) -> bool:
+        return item in str(self)
+
+@dataclass
+class Plan:
+    """Column-oriented tool-call plan.
+
+    Parallel lists indexed by node position: the annotate, enforce and
+    execute passes each walk one or two columns, so packing fields
+    per-column keeps their reads adjacent instead of scattered across
+    per-node dicts.
+    """
+    tools: List[str] = field(default_factory=list)
+    params: List[Dict[str, Any]] = field(default_factory=list)
+    caps: List[Optional[str]] = field(default_factory=list)
+    results: List[bool] = field(default_factory=list)
+
 class SecureInterpreter:
     """A secure interpreter for executing pseudo-code with security policy enforcement.
     
@@ -15,9 +98,25 @@ class SecureInterpreter:
     """
     
     def __init__(self, tool_registry: Dict[str, Dict[str, Any]], policy_manager):
-        self.tool_registry = tool_registry
+        # Interned tool names make the registry lookups and capability
+        # comparisons in the hot loops pointer-compare fast
+        self.tool_registry = {sys.intern(name): entry for name, entry in tool_registry.items()}
         self.policy_manager = policy_manager
         self.execution_log = []
+
+    @staticmethod
+    def _intern_tool_call(tool_call: Any) -> Any:
+        """Intern the tool name and capability of one parsed tool call."""
+        if isinstance(tool_call, dict):
+            tool = tool_call.get('tool')
+            if isinstance(tool, str):
+                tool_call['tool'] = sys.intern(tool)
+            params = tool_call.get('params')
+            if isinstance(params, dict):
+                capability = params.get('capability')
+                if isinstance(capability, str):
+                    params['capability'] = sys.intern(capability)
+        return tool_call
         
     def parse_pseudo_code(self, code: str) -> List[Dict[str, Any]]:
         """Parse pseudo-code into a list of tool calls.
@@ -29,149 +128,181 @@ class SecureInterpreter:
             A list of dictionaries representing tool calls
         """
         logger.info("Parsing pseudo-code into tool calls")
-        
+
+        # Large generated plans take the JIT-scanned fast path when numba
+        # is available; it finds the dict spans without parsing the
+        # surrounding module
+        if _brace_spans is not None and len(code) >= _SCAN_MIN_LEN:
+            return self._parse_pseudo_code_scan(code)
+
         tool_calls = []
-        
-        # Simple parsing for our specific pseudo-code format
-        # In a real implementation, this would use a proper parser
-        for line in code.splitlines():
-            if "tool_calls.append" in line:
-                # Extract the tool call information
+
+        # One C-level parse of the whole source replaces the per-line
+        # find/split/strip scaffolding, and literal_eval preserves nested
+        # dicts and value types exactly
+        try:
+            tree = ast.parse(code)
+        except SyntaxError:
+            # Generated plans are often uniformly indented below an
+            # unindented comment line; retry with the indentation stripped
+            try:
+                tree = ast.parse('\n'.join(line.strip() for line in code.splitlines()))
+            except SyntaxError:
+                # The agent's generated lines carry a trailing ')' that no
+                # whole-module parse accepts; recover each call with the
+                # same brace-span extraction the agent itself uses
+                for line in code.splitlines():
+                    if 'tool_calls.append' not in line:
+                        continue
+                    tool_call = _parse_tool_call(line)
+                    if tool_call is None:
+                        logger.error("Error parsing tool call: %s", line.strip())
+                        continue
+                    tool_calls.append(self._intern_tool_call(tool_call))
+                return tool_calls
+
+        for node in ast.walk(tree):
+            if (isinstance(node, ast.Call)
+                    and getattr(node.func, 'attr', None) == 'append'
+                    and getattr(getattr(node.func, 'value', None), 'id', None) == 'tool_calls'
+                    and node.args):
                 try:
-                    # Find the start and end of the tool call dictionary
-                    dict_start = line.find("{") 
-                    dict_end = line.rfind("})") 
-                    
-                    if dict_start != -1 and dict_end != -1:
-                        # Extract the dictionary string
-                        dict_str = line[dict_start:dict_end+1]
-                        
-                        # Parse the tool name
-                        tool_start = dict_str.find("'tool':") 
-                        tool_end = dict_str.find(",", tool_start)
-                        tool_name = dict_str[tool_start:tool_end].split(":")[1].strip().strip("'")
-                        
-                        # Parse the parameters
-                        params_start = dict_str.find("'params':") 
-                        params_end = dict_str.find("}", params_start)
-                        params_str = dict_str[params_start:params_end+1].split(":", 1)[1].strip()
-                        
-                        # Convert params string to dictionary
-                        params = {}
-                        for param_pair in params_str.strip("{").strip("}").split(","):
-                            if ':' in param_pair:
-                                key, value = param_pair.split(":", 1)
-                                params[key.strip().strip("'")] = value.strip().strip("'")
-                        
-                        # Create the tool call dictionary
-                        tool_call = {
-                            'tool': tool_name,
-                            'params': params
-                        }
-                        
-                        tool_calls.append(tool_call)
-                        logger.debug(f"Parsed tool call: {tool_call}")
-                except Exception as e:
+                    tool_call = ast.literal_eval(node.args[0])
+                except ValueError as e:
                     logger.error(f"Error parsing tool call: {str(e)}")
-        
+                    continue
+                tool_calls.append(self._intern_tool_call(tool_call))
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Parsed tool call: %s", tool_call)
+
         return tool_calls
-    
-    def build_dependency_graph(self, tool_calls: List[Dict[str, Any]]) -> nx.DiGraph:
+
+    def _parse_pseudo_code_scan(self, code: str) -> List[Dict[str, Any]]:
+        """JIT-scanned variant of parse_pseudo_code for large sources.
+
+        A numba kernel scans a uint8 view of the source for balanced
+        dict literals; only spans directly preceded by
+        tool_calls.append( are handed to ast.literal_eval.
+        """
+        tool_calls = []
+        data = code.encode('utf-8')
+        starts, ends = _brace_spans(np.frombuffer(data, dtype=np.uint8))
+        for start, end in zip(starts, ends):
+            if not data.endswith(_APPEND_PREFIX, 0, start):
+                continue
+            try:
+                tool_calls.append(self._intern_tool_call(ast.literal_eval(data[start:end].decode('utf-8'))))
+            except (SyntaxError, ValueError) as e:
+                logger.error(f"Error parsing tool call: {str(e)}")
+        return tool_calls
+
+    def build_dependency_graph(self, tool_calls: List[Dict[str, Any]]) -> Plan:
         """Build a data flow dependency graph from tool calls.
-        
+
         Args:
             tool_calls: The list of tool calls
-            
+
         Returns:
-            A directed graph representing data dependencies
+            A Plan holding the (currently edgeless) tool calls in
+            column-oriented form
         """
         logger.info("Building dependency graph from tool calls")
-        
-        G = nx.DiGraph()
-        
-        # Add nodes for each tool call
-        for i, tool_call in enumerate(tool_calls):
-            node_id = f"tool_{i}"
-            G.add_node(node_id, **tool_call)
-            
-            # In a real implementation, we would analyze data dependencies
-            # between tool calls and add edges accordingly
-            # For simplicity, we're just adding nodes without edges here
-        
-        logger.debug(f"Dependency graph created with {len(G.nodes)} nodes")
-        return G
+
+        # Column-oriented layout: each downstream pass touches one or two
+        # fields for every node, so parallel lists keep those reads
+        # adjacent instead of hopping between per-node dicts.
+        # In a real implementation, we would analyze data dependencies
+        # between tool calls and link nodes accordingly
+        plan = Plan(
+            tools=[tc.get('tool', '') for tc in tool_calls],
+            params=[tc.get('params', {}) for tc in tool_calls],
+        )
+        plan.caps = [None] * len(plan.tools)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Dependency graph created with %d nodes", len(plan.tools))
+        return plan
     
-    def annotate_capabilities(self, graph: nx.DiGraph) -> nx.DiGraph:
+    def annotate_capabilities(self, graph: Plan) -> Plan:
         """Annotate the dependency graph with capability information.
         
         Args:
-            graph: The dependency graph to annotate
+            graph: The plan to annotate
             
         Returns:
-            The annotated dependency graph
+            The annotated plan
         """
         logger.info("Annotating dependency graph with capabilities")
-        
-        for node in graph.nodes:
-            tool_name = graph.nodes[node].get('tool', '')
-            params = graph.nodes[node].get('params', {})
-            
-            # Extract capability information from the parameters
-            capability = params.get('capability', 'untrusted')
-            
-            # Annotate the node with the capability
-            graph.nodes[node]['capability'] = capability
-            logger.debug(f"Node {node} annotated with capability: {capability}")
-                
+
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        caps = graph.caps
+        for i, params in enumerate(graph.params):
+            # Pop the capability out of the params so execute_plan can
+            # pass them to the tool with no per-node copy-and-delete
+            capability = params.pop('capability', 'untrusted')
+            caps[i] = capability
+            if debug_enabled:
+                logger.debug("Node tool_%d annotated with capability: %s", i, capability)
+
         return graph
     
-    def enforce_policies(self, graph: nx.DiGraph) -> Dict[str, bool]:
+    def enforce_policies(self, graph: Plan) -> List[bool]:
         """Enforce security policies on the annotated dependency graph.
         
         Args:
-            graph: The annotated dependency graph
+            graph: The annotated plan
             
         Returns:
-            A dictionary mapping node IDs to policy compliance results
+            A list of per-node policy compliance results, parallel to the
+            plan's columns
         """
         logger.info("Enforcing security policies on dependency graph")
-        
-        policy_results = {}
-        
-        for node in graph.nodes:
-            tool_name = graph.nodes[node].get('tool', '')
-            params = graph.nodes[node].get('params', {})
-            capability = graph.nodes[node].get('capability', 'untrusted')
-            
+
+        # Hot loop: bind the lookups once instead of re-hashing the same
+        # keys and attributes for every node
+        registry_get = self.tool_registry.get
+        enforce = self.policy_manager.enforce_policy
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+
+        policy_results = [False] * len(graph.tools)
+
+        for i, tool_name in enumerate(graph.tools):
+            tool_entry = registry_get(tool_name)
+
             # Check if the tool exists in the registry
-            if tool_name in self.tool_registry:
-                # Check if the required capabilities are satisfied
-                required_capabilities = self.tool_registry[tool_name].get('required_capabilities', [])
-                
-                # For simplicity, we're just checking if the capability is in the required list
+            if tool_entry is not None:
+                # Check if the required capabilities are satisfied; the
+                # frozenset is built once per registry entry on first use
+                required_capabilities = tool_entry.get('required_set')
+                if required_capabilities is None:
+                    required_capabilities = tool_entry.setdefault(
+                        'required_set',
+                        frozenset(map(sys.intern, tool_entry.get('required_capabilities', ()))))
+                capability = graph.caps[i]
+
+                # For simplicity, we're just checking if the capability is in the required set
                 if capability in required_capabilities:
                     # Now check the security policies
-                    if self.policy_manager.enforce_policy(tool_name, params):
-                        policy_results[node] = True
-                        logger.debug(f"Node {node} ({tool_name}) passed policy check")
+                    if enforce(tool_name, graph.params[i]):
+                        policy_results[i] = True
+                        if debug_enabled:
+                            logger.debug("Node tool_%d (%s) passed policy check", i, tool_name)
                     else:
-                        policy_results[node] = False
-                        logger.warning(f"Node {node} ({tool_name}) failed policy check")
+                        logger.warning("Node tool_%d (%s) failed policy check", i, tool_name)
                 else:
-                    policy_results[node] = False
-                    logger.warning(f"Node {node} ({tool_name}) failed capability check: {capability} not in {required_capabilities}")
+                    logger.warning("Node tool_%d (%s) failed capability check: %s not in %s", i, tool_name, capability, required_capabilities)
             else:
-                policy_results[node] = False
-                logger.warning(f"Node {node} references unknown tool: {tool_name}")
-                
+                logger.warning("Node tool_%d references unknown tool: %s", i, tool_name)
+
+        graph.results = policy_results
         return policy_results
     
-    def execute_plan(self, graph: nx.DiGraph, policy_results: Dict[str, bool]) -> List[str]:
+    def execute_plan(self, graph: Plan, policy_results: List[bool]) -> List[str]:
         """Execute the validated plan by checking each tool call against security policies.
         
         Args:
-            graph: The annotated dependency graph
-            policy_results: The results of policy enforcement
+            graph: The annotated plan
+            policy_results: The per-node results of policy enforcement
             
         Returns:
             A list of execution results
@@ -179,41 +310,99 @@ class SecureInterpreter:
         logger.info("Executing validated plan")
         
         result_log = []
-        
-        for node in graph.nodes:
-            tool_name = graph.nodes[node].get('tool', '')
-            params = graph.nodes[node].get('params', {}).copy()  # Make a copy to avoid modifying the original
-            
+
+        registry_get = self.tool_registry.get
+
+        for i, tool_name in enumerate(graph.tools):
+            # Annotation already stripped the capability key, so no copy
+            params = graph.params[i]
+
             # Check if the node passed policy enforcement
-            if policy_results.get(node, False):
-                # Remove capability from params before execution
-                if 'capability' in params:
-                    del params['capability']
-                
+            if policy_results[i]:
                 # Execute the tool
-                if tool_name in self.tool_registry:
+                tool_entry = registry_get(tool_name)
+                if tool_entry is not None:
                     try:
-                        tool_func = self.tool_registry[tool_name].get('function')
+                        tool_func = tool_entry.get('function')
                         if tool_func:
                             result = tool_func(**params)
                             result_log.append(f"Successfully executed {tool_name}: {result}")
-                            logger.info(f"Successfully executed {tool_name}")
+                            logger.info("Successfully executed %s", tool_name)
                         else:
                             result_log.append(f"No function defined for tool: {tool_name}")
-                            logger.warning(f"No function defined for tool: {tool_name}")
+                            logger.warning("No function defined for tool: %s", tool_name)
                     except Exception as e:
                         result_log.append(f"Error executing {tool_name}: {str(e)}")
-                        logger.error(f"Error executing {tool_name}: {str(e)}")
+                        logger.error("Error executing %s: %s", tool_name, e)
                 else:
                     result_log.append(f"Unknown tool: {tool_name}")
-                    logger.warning(f"Unknown tool: {tool_name}")
+                    logger.warning("Unknown tool: %s", tool_name)
             else:
-                # Node failed policy enforcement
-                result_log.append(f"Security policy violation: {tool_name} with params {params}")
-                logger.warning(f"Security policy violation: {tool_name} with params {params}")
+                # Node failed policy enforcement; the message renders its
+                # params repr only if something reads it
+                result_log.append(_ViolationMsg(tool_name, params))
+                logger.warning("Security policy violation: %s with params %s", tool_name, params)
                 
         return result_log
     
+    def interpret_fast(self, code: str) -> List[str]:
+        """Single-pass variant of interpret.
+
+        The nodes carry no cross-edges yet, so annotation, capability and
+        policy checks, and execution can be fused into one loop over the
+        parsed tool calls: same results as the staged pipeline with a
+        third of the iteration and field-access overhead.
+
+        Args:
+            code: The pseudo-code to interpret
+
+        Returns:
+            A list of execution results
+        """
+        logger.info("Interpreting pseudo-code (fused pass)")
+
+        tool_calls = self.parse_pseudo_code(code)
+        if not tool_calls:
+            return []
+
+        result_log = []
+        registry_get = self.tool_registry.get
+        enforce = self.policy_manager.enforce_policy
+
+        for tc in tool_calls:
+            tool_name = tc.get('tool', '')
+            params = tc.get('params', {})
+            capability = params.pop('capability', 'untrusted')
+
+            tool_entry = registry_get(tool_name)
+            if tool_entry is not None:
+                required = tool_entry.get('required_set')
+                if required is None:
+                    required = tool_entry.setdefault(
+                        'required_set',
+                        frozenset(map(sys.intern, tool_entry.get('required_capabilities', ()))))
+            if tool_entry is None or capability not in required or not enforce(tool_name, params):
+                result_log.append(_ViolationMsg(tool_name, params))
+                logger.warning("Security policy violation: %s with params %s", tool_name, params)
+                continue
+
+            tool_func = tool_entry.get('function')
+            if not tool_func:
+                result_log.append(f"No function defined for tool: {tool_name}")
+                logger.warning("No function defined for tool: %s", tool_name)
+                continue
+            try:
+                result = tool_func(**params)
+            except Exception as e:
+                result_log.append(f"Error executing {tool_name}: {str(e)}")
+                logger.error("Error executing %s: %s", tool_name, e)
+                continue
+            result_log.append(f"Successfully executed {tool_name}: {result}")
+            logger.info("Successfully executed %s", tool_name)
+
+        self.execution_log.extend(result_log)
+        return result_log
+
     def interpret(self, code: str) -> List[str]:
         """Interpret pseudo-code with security policy enforcement.
         
@@ -223,11 +412,16 @@ class SecureInterpreter:
         Returns:
             A list of execution results
         """
-        logger.info(f"Interpreting pseudo-code")
+        logger.info("Interpreting pseudo-code")
         
         # Step 1: Parse the pseudo-code into tool calls
         tool_calls = self.parse_pseudo_code(code)
-        
+
+        # No tool calls (common for injection attempts that never emit
+        # tool_calls.append) means nothing to build, check, or run
+        if not tool_calls:
+            return []
+
         # Step 2: Build dependency graph from the tool calls
         dependency_graph = self.build_dependency_graph(tool_calls)
         
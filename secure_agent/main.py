@@ -3,7 +3,7 @@ import argparse
 from typing import Dict, Any, List, Optional
 import os
 
-from agent import SecureAgent
+from agent import SecureAgent, ExecutionStatus
 from policies import policy_manager, enforce_policy
 from data_flow import DataFlowTracker
 from interpreter import SecureInterpreter
@@ -84,20 +84,18 @@ def main():
             print(f"\n----- Query {i+1}: {query} -----")
             
             # Store the query in the database
-            pseudo_code = agent.extract_control_flow(query)
+            pseudo_code, _ = agent.extract_control_flow(query)
             db.store_query(query, pseudo_code)
             
             # Process the query
             results = agent.process_query(query)
             
             # Log the execution in the database
-            for j, result in enumerate(results):
-                if "Successfully executed" in result:
-                    tool_name = result.split("Successfully executed ")[1].split(":")[0]
-                    db.log_execution(tool_name, {}, result, True, None, 0.1)
-                elif "Security policy violation" in result:
-                    tool_name = result.split("Security policy violation: ")[1].split(" ")[0]
-                    db.log_security_violation(tool_name, {}, "email_domain_policy", result)
+            for result in results:
+                if result.status is ExecutionStatus.SUCCESS:
+                    db.log_execution(result.tool, {}, result, True, None, 0.1)
+                elif result.status is ExecutionStatus.POLICY_VIOLATION:
+                    db.log_security_violation(result.tool or 'unknown', {}, "email_domain_policy", result)
             
             print("Results:")
             for result in results:
@@ -125,20 +123,18 @@ def main():
         print(f"\nProcessing query: {query}\n")
         
         # Store the query in the database
-        pseudo_code = agent.extract_control_flow(query)
+        pseudo_code, _ = agent.extract_control_flow(query)
         db.store_query(query, pseudo_code)
         
         # Process the query
         results = agent.process_query(query)
         
         # Log the execution in the database
-        for i, result in enumerate(results):
-            if "Successfully executed" in result:
-                tool_name = result.split("Successfully executed ")[1].split(":")[0]
-                db.log_execution(tool_name, {}, result, True, None, 0.1)
-            elif "Security policy violation" in result:
-                tool_name = result.split("Security policy violation: ")[1].split(" ")[0]
-                db.log_security_violation(tool_name, {}, "email_domain_policy", result)
+        for result in results:
+            if result.status is ExecutionStatus.SUCCESS:
+                db.log_execution(result.tool, {}, result, True, None, 0.1)
+            elif result.status is ExecutionStatus.POLICY_VIOLATION:
+                db.log_security_violation(result.tool or 'unknown', {}, "email_domain_policy", result)
         
         print("Results:")
         for result in results:
@@ -1,10 +1,39 @@
+import functools
 import logging
-from typing import Dict, Any, List, Optional
+import re
+from typing import Callable, Dict, Any, List, Optional, Tuple
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Which policies apply to which tool; hoisted to module scope so the
+# mapping is built once, not per enforcement call
+_TOOL_POLICY_MAP = {
+    'send_email': ('email_domain_policy', 'attachment_policy'),
+    'search_document': ('query_sanitization_policy',),
+    # Add more tools and their applicable policies here
+}
+
+# Forbidden SQL fragments as one precompiled case-insensitive union; a
+# single C-level scan replaces four lowered-substring passes per query
+_FORBIDDEN_SQL_RE = re.compile(r'drop\s+table|delete\s+from|truncate\s+table|;', re.IGNORECASE)
+
+# str.endswith takes a tuple, so one call covers every forbidden extension
+_FORBIDDEN_EXTENSIONS = ('.exe', '.bat', '.sh', '.js')
+
+# frozenset for O(1) domain membership with no per-call list allocation
+_TRUSTED_DOMAINS = frozenset({'company.com', 'partner.org'})
+
+@functools.lru_cache(maxsize=None)
+def _applicable_policies(tool_name: str) -> Tuple[str, ...]:
+    """Memoized lookup of the policies that apply to a tool.
+
+    The mapping is static, so repeat enforcement calls for the same tool
+    hit the cache instead of re-running the dict lookup and default.
+    """
+    return _TOOL_POLICY_MAP.get(tool_name, ())
+
 class SecurityPolicyManager:
     """Manages security policies for the secure agent.
     
@@ -14,11 +43,42 @@ class SecurityPolicyManager:
     
     def __init__(self):
         self.policies = {}
-        
+        # Per-tool checks compiled from the policy set; rebuilt lazily
+        # after registration changes
+        self._compiled: Dict[str, Callable[[Dict[str, Any]], bool]] = {}
+
     def register_policy(self, policy_name: str, policy_func: callable):
         """Register a security policy with the manager."""
         self.policies[policy_name] = policy_func
+        self._compiled.clear()
         logger.info(f"Registered policy: {policy_name}")
+
+    def _compile(self, tool_name: str) -> Callable[[Dict[str, Any]], bool]:
+        """Compile the tool's applicable policies into one short-circuit check.
+
+        The closure captures the policy callables in a tuple, so each
+        enforcement is one cached dict lookup plus a tight all() instead
+        of a name lookup and dispatch per policy.
+        """
+        policy_names = _TOOL_POLICY_MAP.get(tool_name, ())
+        if all(name in self.policies for name in policy_names):
+            fns = tuple(self.policies[name] for name in policy_names)
+
+            def compiled(params: Dict[str, Any], _fns=fns) -> bool:
+                try:
+                    return all(fn(params) for fn in _fns)
+                except Exception as e:
+                    logger.error(f"Error enforcing policies for {tool_name}: {str(e)}")
+                    return False
+        else:
+            # A mapped policy is missing from the registry; mirror
+            # enforce_policy's unknown-policy denial
+            def compiled(params: Dict[str, Any]) -> bool:
+                logger.warning(f"Unregistered policy mapped to tool: {tool_name}")
+                return False
+
+        self._compiled[tool_name] = compiled
+        return compiled
         
     def enforce_policy(self, policy_name: str, params: Dict[str, Any]) -> bool:
         """Enforce a specific security policy.
@@ -33,7 +93,7 @@ class SecurityPolicyManager:
         if policy_name in self.policies:
             try:
                 result = self.policies[policy_name](params)
-                logger.info(f"Policy {policy_name} enforcement result: {result}")
+                logger.info("Policy %s enforcement result: %s", policy_name, result)
                 return result
             except Exception as e:
                 logger.error(f"Error enforcing policy {policy_name}: {str(e)}")
@@ -53,15 +113,30 @@ class SecurityPolicyManager:
             A dictionary mapping policy names to enforcement results
         """
         results = {}
-        
+
         # Determine which policies apply to this tool
         applicable_policies = self._get_applicable_policies(tool_name)
-        
+
         # Enforce each applicable policy
         for policy_name in applicable_policies:
             results[policy_name] = self.enforce_policy(policy_name, params)
-            
+
         return results
+
+    def enforce_all_policies_fast(self, tool_name: str, params: Dict[str, Any]) -> bool:
+        """Boolean fast path over the compiled per-tool policy check.
+
+        Args:
+            tool_name: The name of the tool being called
+            params: The parameters being passed to the tool
+
+        Returns:
+            True if all applicable policies are satisfied, False otherwise
+        """
+        compiled = self._compiled.get(tool_name)
+        if compiled is None:
+            compiled = self._compile(tool_name)
+        return compiled(params)
     
     def _get_applicable_policies(self, tool_name: str) -> List[str]:
         """Get the list of policies that apply to a specific tool.
@@ -73,14 +148,8 @@ class SecurityPolicyManager:
             A list of policy names that apply to the tool
         """
         # In a real implementation, this would be more sophisticated
-        # For now, we'll use a simple mapping
-        tool_policy_map = {
-            'send_email': ['email_domain_policy', 'attachment_policy'],
-            'search_document': ['query_sanitization_policy'],
-            # Add more tools and their applicable policies here
-        }
-        
-        return tool_policy_map.get(tool_name, [])
+        # For now, we'll use a simple cached mapping
+        return _applicable_policies(tool_name)
 
 # Example policy functions
 def email_domain_policy(params: Dict[str, Any]) -> bool:
@@ -93,16 +162,10 @@ def email_domain_policy(params: Dict[str, Any]) -> bool:
         True if the recipient is from a trusted domain, False otherwise
     """
     recipient = params.get('recipient', '')
-    
-    # List of trusted domains
-    trusted_domains = ['company.com', 'partner.org']
-    
-    # Check if the recipient's domain is in the trusted domains list
-    if '@' in recipient:
-        domain = recipient.split('@')[-1]
-        return domain in trusted_domains
-    
-    return False
+
+    # rfind gives the domain in one scan with no split allocation
+    at = recipient.rfind('@')
+    return at != -1 and recipient[at + 1:] in _TRUSTED_DOMAINS
 
 def attachment_policy(params: Dict[str, Any]) -> bool:
     """Enforce that email attachments are allowed.
@@ -113,17 +176,8 @@ def attachment_policy(params: Dict[str, Any]) -> bool:
     Returns:
         True if the attachment is allowed, False otherwise
     """
-    document = params.get('document', '')
-    
-    # List of forbidden attachment types
-    forbidden_extensions = ['.exe', '.bat', '.sh', '.js']
-    
     # Check if the document has a forbidden extension
-    for ext in forbidden_extensions:
-        if document.lower().endswith(ext):
-            return False
-    
-    return True
+    return not params.get('document', '').lower().endswith(_FORBIDDEN_EXTENSIONS)
 
 def query_sanitization_policy(params: Dict[str, Any]) -> bool:
     """Enforce that search queries are sanitized.
@@ -134,17 +188,8 @@ def query_sanitization_policy(params: Dict[str, Any]) -> bool:
     Returns:
         True if the query is sanitized, False otherwise
     """
-    query = params.get('query', '')
-    
-    # List of forbidden patterns in queries
-    forbidden_patterns = ['DROP TABLE', 'DELETE FROM', 'TRUNCATE TABLE', ';']
-    
     # Check if the query contains any forbidden patterns
-    for pattern in forbidden_patterns:
-        if pattern.lower() in query.lower():
-            return False
-    
-    return True
+    return _FORBIDDEN_SQL_RE.search(params.get('query', '')) is None
 
 # Create a global policy manager instance
 policy_manager = SecurityPolicyManager()
@@ -165,7 +210,6 @@ def enforce_policy(tool_name: str, params: Dict[str, Any]) -> bool:
     Returns:
         True if all policies are satisfied, False otherwise
     """
-    results = policy_manager.enforce_all_policies(tool_name, params)
-    
-    # All policies must be satisfied
-    return all(results.values())
+    # The compiled fast path short-circuits on the first failing policy
+    # and allocates no per-call results dict
+    return policy_manager.enforce_all_policies_fast(tool_name, params)
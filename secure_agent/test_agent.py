@@ -18,14 +18,20 @@ def search_document(query: str) -> str:
     return f"Found 3 documents matching query: {query}"
 
 class TestSecureAgent(unittest.TestCase):
-    def setUp(self):
-        # Create a secure agent for testing
-        self.agent = SecureAgent()
-        
+    @classmethod
+    def setUpClass(cls):
+        # Agent construction and tool registration are identical for
+        # every test method, so build the fixture once per class
+        cls.agent = SecureAgent()
+
         # Register tools with their required capabilities
-        self.agent.register_tool('send_email', send_email, ['trusted_email'])
-        self.agent.register_tool('search_document', search_document, ['user_query'])
-    
+        cls.agent.register_tool('send_email', send_email, ['trusted_email'])
+        cls.agent.register_tool('search_document', search_document, ['user_query'])
+
+    def setUp(self):
+        # Drop per-query state so methods stay order-independent
+        self.agent.reset()
+
     def test_safe_query_processing(self):
         """Test that safe queries are processed correctly."""
         query = "Can you send Bob the document he requested in our last meeting?"
@@ -1,9 +1,17 @@
 """Visualization module for the secure AI agent."""
 
+import io
 import os
 import json
+import numpy as np
 import networkx as nx
-import matplotlib.pyplot as plt
+import matplotlib
+# Headless rasterizer up front: no GUI backend probing, and the OO API
+# below never touches pyplot's global figure manager
+matplotlib.use('Agg', force=True)
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 import argparse
@@ -15,6 +23,11 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(level
 logger = logging.getLogger(__name__)
 
 # Try to import optional dependencies
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 try:
     import pygraphviz
     HAS_PYGRAPHVIZ = True
@@ -27,6 +40,36 @@ try:
 except ImportError:
     HAS_PYDOT = False
 
+# Node fill colors by node type; unknown types get the default
+_NODE_PALETTE = {
+    'input': '#AED6F1',    # Light blue
+    'process': '#D5F5E3',  # Light green
+    'output': '#FADBD8',   # Light red
+}
+_NODE_DEFAULT_COLOR = '#F5EEF8'  # Light purple
+
+# Integer-coded palette for the matplotlib path: one uint8 code per node
+# and a single fancy-index gather expand to RGBA in C
+_TYPE_CODES = {'input': 0, 'process': 1, 'output': 2}
+_PALETTE_RGBA = np.array([
+    [174, 214, 241, 255],  # input
+    [213, 245, 227, 255],  # process
+    [250, 219, 216, 255],  # output
+    [245, 238, 248, 255],  # default
+], dtype=np.float64) / 255.0
+
+def _color_for(node_data: Dict[str, Any]) -> str:
+    """Fill color for a node dict, keyed on its 'type' entry.
+
+    One hash lookup with a default replaces the per-node if/elif ladder,
+    and keeps every palette consumer on the same table.
+    """
+    return _NODE_PALETTE.get(node_data.get('type'), _NODE_DEFAULT_COLOR)
+
+def _dot_escape(text: str) -> str:
+    """Escape quotes and newlines for use inside a DOT double-quoted string."""
+    return text.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
 class DataFlowVisualizer:
     """Visualizer for data flow graphs."""
     
@@ -42,6 +85,9 @@ class DataFlowVisualizer:
         os.makedirs(self.output_dir, exist_ok=True)
         self.conn = None
         self.cursor = None
+        # (stat key, graph) from the last load; reruns on an unchanged
+        # database skip SQLite entirely
+        self._cache: Optional[tuple] = None
         
         # Check if the database file exists
         if not os.path.exists(db_path):
@@ -54,8 +100,36 @@ class DataFlowVisualizer:
     def _connect(self):
         """Connect to the SQLite database."""
         try:
-            self.conn = sqlite3.connect(self.db_path)
+            # A larger statement cache keeps repeat queries at a cache
+            # hit instead of a fresh sqlite3_prepare
+            self.conn = sqlite3.connect(self.db_path, cached_statements=256)
             self.conn.row_factory = sqlite3.Row  # Return rows as dictionaries
+            # Read-tuned connection: WAL avoids writer stalls, the big
+            # mmap/cache let SQLite page the file without read() copies
+            self.conn.executescript(
+                "PRAGMA journal_mode=WAL;"
+                "PRAGMA synchronous=NORMAL;"
+                "PRAGMA temp_store=MEMORY;"
+                "PRAGMA mmap_size=268435456;"
+                "PRAGMA cache_size=-65536;"
+            )
+            # Databases written by older schema versions may predate these
+            # indexes; same names and columns as SecureDatabase creates,
+            # so this is a no-op on current files. Skip databases that
+            # lack the tables entirely (e.g. empty or foreign files) —
+            # loading handles those, connecting should not fail on them
+            tables = {row[0] for row in self.conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='table'")}
+            if 'data_node_capabilities' in tables:
+                self.conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_data_node_capabilities_node_id "
+                    "ON data_node_capabilities (node_id, capability)"
+                )
+            if 'data_node_edges' in tables:
+                self.conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_data_node_edges_source_id "
+                    "ON data_node_edges (source_id)"
+                )
             self.cursor = self.conn.cursor()
             logger.debug(f"Connected to database: {self.db_path}")
         except sqlite3.Error as e:
@@ -75,55 +149,69 @@ class DataFlowVisualizer:
             A dictionary representing the data flow graph
         """
         try:
+            # Two stat calls tell us whether anything changed since the
+            # last load; under WAL unflushed writes land in the -wal file,
+            # so its stat is part of the key
+            key = self._db_stat_key()
+            if self._cache is not None and self._cache[0] == key:
+                return self._cache[1]
+
             # Create a dictionary to store the data flow graph
             data_flow = {'data_nodes': [], 'data_edges': []}
-            
-            # Load nodes
-            self.cursor.execute("SELECT id, data, source FROM data_nodes")
-            nodes = self.cursor.fetchall()
-            
-            for node in nodes:
-                node_id = node[0]
-                data = node[1]
-                source = node[2]
-                
-                # Load node capabilities
-                self.cursor.execute(
-                    "SELECT capability FROM data_node_capabilities WHERE node_id = ?",
-                    (node_id,)
-                )
-                capabilities = [row[0] for row in self.cursor.fetchall()]
-                
-                # Add node to the data flow graph
-                data_flow['data_nodes'].append({
-                    'id': node_id,
-                    'type': source,
-                    'value': data,
-                    'capabilities': capabilities
-                })
-            
-            # Load edges
-            self.cursor.execute(
+
+            # Load nodes and their capabilities in one JOIN instead of a
+            # capability query per node (the classic N+1 pattern); rows
+            # arrive ordered so each node's capabilities are contiguous
+            cur = self.conn.execute(
+                "SELECT n.id, n.data, n.source, c.capability "
+                "FROM data_nodes n "
+                "LEFT JOIN data_node_capabilities c ON c.node_id = n.id "
+                "ORDER BY n.id"
+            )
+            cur.arraysize = 1000
+
+            node = None
+            for node_id, data, source, capability in cur:
+                if node is None or node['id'] != node_id:
+                    node = {
+                        'id': node_id,
+                        'type': source,
+                        'value': data,
+                        'capabilities': []
+                    }
+                    data_flow['data_nodes'].append(node)
+                if capability is not None:
+                    node['capabilities'].append(capability)
+
+            # Load edges, again consuming rows straight off the cursor
+            # rather than materializing a second full list
+            cur = self.conn.execute(
                 "SELECT source_id, target_id, relationship FROM data_node_edges"
             )
-            edges = self.cursor.fetchall()
-            
-            for edge in edges:
-                source_id = edge[0]
-                target_id = edge[1]
-                relationship = edge[2]
-                
+            for source_id, target_id, relationship in cur:
                 # Add edge to the data flow graph
                 data_flow['data_edges'].append({
                     'source': source_id,
                     'target': target_id,
                     'type': relationship
                 })
-            
+
+            self._cache = (key, data_flow)
             return data_flow
         except sqlite3.Error as e:
             logger.error(f"Error loading data flow graph: {str(e)}")
             raise
+
+    def _db_stat_key(self) -> tuple:
+        """Cheap change-detection key for the database and its WAL file."""
+        st = os.stat(self.db_path)
+        key = [st.st_mtime_ns, st.st_size]
+        try:
+            wal = os.stat(self.db_path + '-wal')
+            key += [wal.st_mtime_ns, wal.st_size]
+        except OSError:
+            pass
+        return tuple(key)
     
     def visualize_data_flow(self, output_file: str = 'data_flow.png'):
         """Visualize the data flow graph from the database.
@@ -153,9 +241,18 @@ class DataFlowVisualizer:
             data_flow: Data flow graph to visualize
             output_file: File to save visualization to
         """
+        output_path = os.path.join(self.output_dir, output_file)
+
+        # With pygraphviz available, emit DOT text straight from the
+        # loaded dict: the scratch DiGraph plus the to_agraph round trip
+        # are two full O(N+E) traversals that add nothing
+        if HAS_PYGRAPHVIZ and output_path.endswith(('.png', '.pdf', '.svg')):
+            pygraphviz.AGraph(string=self._emit_dot(data_flow)).draw(output_path, prog='dot')
+            return output_path
+
         # Create a directed graph
         G = nx.DiGraph()
-        
+
         # Add nodes
         for node in data_flow.get('data_nodes', []):
             node_id = node.get('id')
@@ -174,10 +271,36 @@ class DataFlowVisualizer:
             G.add_edge(source, target, type=edge_type)
         
         # Save visualization
-        output_path = os.path.join(self.output_dir, output_file)
         self._save_visualization(G, output_path)
-        
+
         return output_path
+
+    def _emit_dot(self, data_flow: Dict[str, Any]) -> str:
+        """Emit DOT source straight from a loaded data flow dict.
+
+        Args:
+            data_flow: Data flow graph to serialize
+
+        Returns:
+            DOT source for the graph
+        """
+        buf = io.StringIO()
+        write = buf.write
+        write('digraph G {\n'
+              'rankdir=LR;\n'
+              'splines=ortho;\n'
+              'node [style=filled, shape=box];\n')
+        for node in data_flow.get('data_nodes', []):
+            node_id = node.get('id')
+            color = _color_for(node)
+            label = _dot_escape(f"{node_id}\n{node.get('value', '')}\n{node.get('capabilities', [])}")
+            write(f'"{_dot_escape(str(node_id))}" [fillcolor="{color}", label="{label}"];\n')
+        for edge in data_flow.get('data_edges', []):
+            write(f'"{_dot_escape(str(edge.get("source")))}" -> '
+                  f'"{_dot_escape(str(edge.get("target")))}" '
+                  f'[label="{_dot_escape(str(edge.get("type", "")))}"];\n')
+        write('}\n')
+        return buf.getvalue()
     
     def _save_visualization(self, G: nx.DiGraph, output_path: str):
         """Save a visualization of a graph.
@@ -209,18 +332,9 @@ class DataFlowVisualizer:
         # Set node attributes
         for node in A.nodes():
             node_data = G.nodes[node]
-            node_type = node_data.get('type', 'unknown')
-            
+
             # Set node color based on type
-            if node_type == 'input':
-                node.attr['fillcolor'] = '#AED6F1'  # Light blue
-            elif node_type == 'process':
-                node.attr['fillcolor'] = '#D5F5E3'  # Light green
-            elif node_type == 'output':
-                node.attr['fillcolor'] = '#FADBD8'  # Light red
-            else:
-                node.attr['fillcolor'] = '#F5EEF8'  # Light purple
-            
+            node.attr['fillcolor'] = _color_for(node_data)
             node.attr['style'] = 'filled'
             node.attr['shape'] = 'box'
             node.attr['label'] = f"{node}\n{node_data.get('value', '')}\n{node_data.get('capabilities', [])}"  # noqa
@@ -269,45 +383,57 @@ class DataFlowVisualizer:
             G: Graph to visualize
             output_path: Path to save visualization to
         """
-        plt.figure(figsize=(12, 8))
-        
-        # Create node colors based on type
-        node_colors = []
-        for node in G.nodes():
-            node_type = G.nodes[node].get('type', 'unknown')
-            
-            if node_type == 'input':
-                node_colors.append('#AED6F1')  # Light blue
-            elif node_type == 'process':
-                node_colors.append('#D5F5E3')  # Light green
-            elif node_type == 'output':
-                node_colors.append('#FADBD8')  # Light red
-            else:
-                node_colors.append('#F5EEF8')  # Light purple
-        
-        # Create node labels
-        node_labels = {}
-        for node in G.nodes():
-            node_data = G.nodes[node]
-            node_labels[node] = f"{node}\n{node_data.get('value', '')}"  # noqa
-        
-        # Create edge labels
-        edge_labels = {}
-        for u, v in G.edges():
-            edge_data = G.get_edge_data(u, v)
-            edge_labels[(u, v)] = edge_data.get('type', '')
-        
+        # Object-oriented figure bound straight to an Agg canvas; the
+        # figure is garbage-collected when it goes out of scope, so
+        # there is no pyplot registry to close out of
+        fig = Figure(figsize=(12, 8))
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot(111)
+
+        # One sweep over the node data builds both columns; repeated
+        # G.nodes[node] indexing goes through networkx's AtlasView (two
+        # dict lookups per access) and was done twice per node before
+        nodes_data = list(G.nodes(data=True))
+        type_codes = np.fromiter(
+            (_TYPE_CODES.get(d.get('type', ''), 3) for _, d in nodes_data),
+            dtype=np.uint8, count=len(nodes_data))
+        node_colors = _PALETTE_RGBA[type_codes]
+        node_labels = {n: f"{n}\n{d.get('value', '')}" for n, d in nodes_data}
+
+        # Same single-sweep treatment for the edge labels
+        edge_labels = {(u, v): d.get('type', '') for u, v, d in G.edges(data=True)}
+
+        # Layout: graphviz's C engines beat the pure-Python O(N^2)
+        # spring_layout by an order of magnitude on large graphs; the
+        # fallback caps iterations as the graph grows and seeds for
+        # reproducible output
+        if HAS_PYGRAPHVIZ:
+            pos = nx.nx_agraph.graphviz_layout(G, prog='sfdp')
+        elif HAS_PYDOT:
+            pos = nx.nx_pydot.graphviz_layout(G, prog='neato')
+        else:
+            pos = nx.spring_layout(
+                G, seed=42, scale=1.0,
+                iterations=min(50, max(5, 500 // max(len(G), 1))))
+
         # Draw
-        pos = nx.spring_layout(G)
-        nx.draw_networkx_nodes(G, pos, node_color=node_colors, node_size=500, alpha=0.8)
-        nx.draw_networkx_edges(G, pos, width=1.0, alpha=0.5, edge_color='gray')
-        nx.draw_networkx_labels(G, pos, labels=node_labels, font_size=8)
-        nx.draw_networkx_edge_labels(G, pos, edge_labels=edge_labels, font_size=8)
-        
-        plt.axis('off')
-        plt.tight_layout()
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        nx.draw_networkx_nodes(G, pos, node_color=node_colors, node_size=500, alpha=0.8, ax=ax)
+        # draw_networkx_edges allocates one FancyArrowPatch per directed
+        # edge; past a couple hundred nodes the arrowheads are invisible
+        # anyway, so batch all segments into a single LineCollection
+        if len(G) < 200:
+            nx.draw_networkx_edges(G, pos, width=1.0, alpha=0.5, edge_color='gray', ax=ax)
+        elif G.edges:
+            segs = np.array([[pos[u], pos[v]] for u, v in G.edges()])
+            ax.add_collection(LineCollection(segs, linewidths=1.0, alpha=0.5, colors='gray'))
+        nx.draw_networkx_labels(G, pos, labels=node_labels, font_size=8, ax=ax)
+        # Edge labels are unreadable past a few hundred edges and cost a
+        # text artist apiece; skip them on huge graphs
+        if len(G.edges) <= 500:
+            nx.draw_networkx_edge_labels(G, pos, edge_labels=edge_labels, font_size=8, ax=ax)
+
+        ax.set_axis_off()
+        fig.savefig(output_path, dpi=300, bbox_inches='tight')
     
     def _save_as_json(self, G: nx.DiGraph, output_path: str):
         """Save a graph as JSON.
@@ -316,37 +442,74 @@ class DataFlowVisualizer:
             G: Graph to save
             output_path: Path to save JSON to
         """
-        data = nx.node_link_data(G)
-        
-        with open(output_path, 'w') as f:
-            json.dump(data, f, indent=2)
+        # Build the node-link dict directly from the graph views;
+        # nx.node_link_data deep-copies every attribute dict on the way
+        data = {
+            'directed': True,
+            'multigraph': False,
+            'graph': {},
+            'nodes': [{'id': n, **d} for n, d in G.nodes(data=True)],
+            'links': [{'source': u, 'target': v, **d} for u, v, d in G.edges(data=True)],
+        }
+
+        # orjson encodes in C and emits bytes; the stdlib encoder stays
+        # as the fallback with identical output shape
+        if orjson is not None:
+            with open(output_path, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(output_path, 'w') as f:
+                json.dump(data, f, indent=2)
 
 
+def _render_one(db_path: str, output_file: str, output_dir: Optional[str] = None):
+    """Render one database's data flow graph to one image.
+
+    Module-level (hence picklable) so a process pool can fan renders out
+    across cores; sqlite3 connections don't pickle, so each worker opens
+    its own inside the child.
+    """
+    visualizer = DataFlowVisualizer(db_path, output_dir)
+    try:
+        visualizer.visualize_data_flow(output_file)
+    finally:
+        visualizer.close()
+
 def main():
     parser = argparse.ArgumentParser(description='Secure Agent Data Flow Visualizer')
     parser.add_argument('--db-path', type=str, help='Path to the SQLite database file',
                         default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'secure_agent.db'))
+    parser.add_argument('--db-paths', type=str,
+                        help='Glob of database files to render in parallel, one PNG each')
     parser.add_argument('--output', type=str, help='Path to the output image file (optional)')
-    
+    parser.add_argument('--output-dir', type=str, help='Directory to save visualizations to (optional)')
+
     args = parser.parse_args()
-    
+
+    # Batch mode: layout and rasterization are CPU-bound Python, so
+    # independent databases render in parallel, one worker per core
+    if args.db_paths:
+        import glob
+        from concurrent.futures import ProcessPoolExecutor
+
+        paths = sorted(glob.glob(args.db_paths))
+        if not paths:
+            print(f"No database files match: {args.db_paths}")
+            return
+        outputs = [f"{Path(p).stem}_data_flow.png" for p in paths]
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as ex:
+            list(ex.map(_render_one, paths, outputs, [args.output_dir] * len(paths)))
+        return
+
     # Create database directory if it doesn't exist
     os.makedirs(os.path.dirname(args.db_path), exist_ok=True)
-    
+
     # Check if the database file exists
     if not os.path.exists(args.db_path):
         print(f"Database file not found: {args.db_path}")
         return
-    
-    # Initialize the data flow visualizer
-    visualizer = DataFlowVisualizer(args.db_path)
-    
-    try:
-        # Visualize the data flow
-        visualizer.visualize_data_flow(args.output)
-    finally:
-        # Close the database connection
-        visualizer.close()
+
+    _render_one(args.db_path, args.output, args.output_dir)
 
 if __name__ == '__main__':
     main()
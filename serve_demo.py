@@ -7,7 +7,7 @@ This script serves the web demo files and handles API requests.
 import os
 import json
 import http.server
-import socketserver
+import socket
 import urllib.parse
 from pathlib import Path
 
@@ -16,18 +16,89 @@ import sys
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from secure_agent import config
 
+# orjson encodes in C and returns bytes directly; the stdlib encoder
+# plus .encode() stays as the fallback
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+    _loads = json.loads
+
 # Constants
 PORT = 8080
 WEB_DEMO_DIR = Path(__file__).parent / 'web_demo'
 
+# Demo queries are tiny; capping the POST body keeps an oversized
+# request from ballooning server memory
+MAX_POST_BYTES = 65536
+
+# The key response never changes for the process lifetime, so serialize
+# it once at import instead of per request
+_KEY_RESPONSE_BYTES = _dumps({
+    'api_key': config.OPENAI_API_KEY or '',
+    'has_key': bool(config.OPENAI_API_KEY)
+})
+
+class DemoServer(http.server.ThreadingHTTPServer):
+    """Threaded demo server: one slow client no longer blocks the rest."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
 class DemoRequestHandler(http.server.SimpleHTTPRequestHandler):
     """Custom request handler for the demo server."""
-    
+
     def __init__(self, *args, **kwargs):
         # Set the directory to serve files from
         self.directory = str(WEB_DEMO_DIR)
         super().__init__(*args, **kwargs)
-    
+
+    def setup(self):
+        super().setup()
+        # The API replies are small JSON bodies; without NODELAY they
+        # can sit out Nagle's ~40 ms delayed-ACK window
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def _send_json(self, body: bytes):
+        """Send one JSON response with an explicit Content-Length.
+
+        The pre-measured length lets the client reuse the connection
+        instead of waiting for a close or chunked framing.
+        """
+        self.send_response(200)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def copyfile(self, source, outputfile):
+        """Copy a static file to the socket via sendfile when possible.
+
+        os.sendfile moves bytes from the page cache straight to the
+        socket in the kernel; the userspace read/write loop in the base
+        class remains the fallback for non-file sources and for
+        platforms (Windows) without os.sendfile.
+        """
+        if not hasattr(os, 'sendfile'):
+            return super().copyfile(source, outputfile)
+        try:
+            in_fd = source.fileno()
+            out_fd = outputfile.fileno()
+        except (AttributeError, OSError):
+            return super().copyfile(source, outputfile)
+        try:
+            while os.sendfile(out_fd, in_fd, None, 1 << 20):
+                pass
+        except OSError:
+            return super().copyfile(source, outputfile)
+
     def do_GET(self):
         """Handle GET requests."""
         # Handle API requests
@@ -64,37 +135,35 @@ class DemoRequestHandler(http.server.SimpleHTTPRequestHandler):
             
             # Get API key endpoint
             if endpoint == 'key' and self.command == 'GET':
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.end_headers()
-                
-                response = {
-                    'api_key': config.OPENAI_API_KEY or '',
-                    'has_key': bool(config.OPENAI_API_KEY)
-                }
-                
-                self.wfile.write(json.dumps(response).encode())
+                self._send_json(_KEY_RESPONSE_BYTES)
                 return
             
             # Process query endpoint
             elif endpoint == 'process' and self.command == 'POST':
-                content_length = int(self.headers['Content-Length'])
-                post_data = self.rfile.read(content_length).decode('utf-8')
-                query_data = json.loads(post_data)
+                content_length = int(self.headers.get('Content-Length', '0'))
+                if content_length <= 0:
+                    self.send_error(411, "Length Required")
+                    return
+                if content_length > MAX_POST_BYTES:
+                    self.send_error(413, "Payload Too Large")
+                    return
+                # Both json.loads and orjson.loads take bytes directly,
+                # so the body never makes an intermediate str copy
+                try:
+                    query_data = _loads(self.rfile.read(content_length))
+                except ValueError:
+                    self.send_error(400, "Malformed JSON body")
+                    return
                 
                 # In a real implementation, this would process the query using the secure agent
                 # For the demo, we'll just echo back the query
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.end_headers()
-                
                 response = {
                     'success': True,
                     'query': query_data.get('query', ''),
                     'result': f"Processed query: {query_data.get('query', '')}"
                 }
-                
-                self.wfile.write(json.dumps(response).encode())
+
+                self._send_json(_dumps(response))
                 return
         
         # Unknown API endpoint
@@ -104,7 +173,7 @@ class DemoRequestHandler(http.server.SimpleHTTPRequestHandler):
 def main():
     """Start the demo server."""
     # Create the server
-    with socketserver.TCPServer(("localhost", PORT), DemoRequestHandler) as httpd:
+    with DemoServer(("localhost", PORT), DemoRequestHandler) as httpd:
         print(f"Serving at http://localhost:{PORT}")
         print(f"Web demo directory: {WEB_DEMO_DIR}")
         print(f"OpenAI API Key: {'Configured' if config.OPENAI_API_KEY else 'Not configured'}")